@@ -1,5 +1,16 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { supabaseAdmin } from '@/lib/supabase'
+import { syncComplianceChecksFromSheet } from '@/lib/sheet-sync'
+import { decodeCursor, encodeCursor, keysetFilter, readLimit } from '@/lib/pagination'
+
+// Column projections; list views only need what the table renders
+const COLUMNS = {
+  list: 'id, created_at, checkType:check_type, checkName:check_name, area, owner, spoc, taskStatus:task_status, status, team, automate, repetition',
+  full: '*'
+}
+
+// 'estimated' reads planner statistics instead of counting rows
+const COUNT_MODES = ['exact', 'planned', 'estimated'] as const
 
 export async function GET(request: NextRequest) {
   try {
@@ -7,11 +18,29 @@ export async function GET(request: NextRequest) {
     const team = searchParams.get('team')
     const status = searchParams.get('status')
     const checkType = searchParams.get('checkType')
+    const limit = readLimit(searchParams.get('limit'))
+    const cursorParam = searchParams.get('cursor')
+    const cursor = decodeCursor(cursorParam)
+    const columns = searchParams.get('view') === 'full' ? COLUMNS.full : COLUMNS.list
+    const countParam = searchParams.get('count')
+    const count = COUNT_MODES.find(mode => mode === countParam)
+
+    if (cursorParam && !cursor) {
+      return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 })
+    }
 
     let query = supabaseAdmin
       .from('compliance_checks')
-      .select('*')
+      .select(columns, count ? { count } : undefined)
+      .is('deleted_at', null)
       .order('created_at', { ascending: false })
+      .order('id', { ascending: false })
+      // One extra row tells us whether another page exists
+      .limit(limit + 1)
+
+    if (cursor) {
+      query = query.or(keysetFilter(cursor))
+    }
 
     if (team && team !== 'all') {
       query = query.eq('team', team)
@@ -25,11 +54,15 @@ export async function GET(request: NextRequest) {
       query = query.eq('check_type', checkType)
     }
 
-    const { data: checks, error } = await query
+    const { data, error, count: total } = await query
 
     if (error) throw error
 
-    return NextResponse.json({ checks })
+    const rows: any[] = data || []
+    const checks = rows.slice(0, limit)
+    const nextCursor = rows.length > limit ? encodeCursor(checks[checks.length - 1]) : null
+
+    return NextResponse.json({ checks, nextCursor, ...(count && { total }) })
   } catch (error) {
     console.error('Get compliance checks error:', error)
     return NextResponse.json(
@@ -38,3 +71,24 @@ export async function GET(request: NextRequest) {
     )
   }
 }
+
+export async function POST(request: NextRequest) {
+  try {
+    const { action, spreadsheetId } = await request.json()
+
+    if (action === 'sync' && spreadsheetId) {
+      // Sync from Google Sheets, touching only rows that changed
+      const result = await syncComplianceChecksFromSheet(spreadsheetId)
+
+      return NextResponse.json({ success: true, ...result })
+    }
+
+    return NextResponse.json({ error: 'Invalid action' }, { status: 400 })
+  } catch (error) {
+    console.error('Sync compliance checks error:', error)
+    return NextResponse.json(
+      { error: 'Failed to sync compliance checks' }, 
+      { status: 500 }
+    )
+  }
+}
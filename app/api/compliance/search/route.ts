@@ -0,0 +1,40 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { supabaseAdmin } from '@/lib/supabase'
+import { readLimit } from '@/lib/pagination'
+
+export async function GET(request: NextRequest) {
+  try {
+    const { searchParams } = new URL(request.url)
+    const q = searchParams.get('q')?.trim()
+    const limit = readLimit(searchParams.get('limit'), 20, 100)
+
+    if (!q) {
+      return NextResponse.json({ checks: [] })
+    }
+
+    const { data, error } = await supabaseAdmin
+      .rpc('search_compliance_checks', { p_query: q, match_count: limit })
+
+    if (error) throw error
+
+    const checks = (data || []).map((row: any) => ({
+      id: row.id,
+      checkType: row.check_type,
+      checkName: row.check_name,
+      area: row.area,
+      owner: row.owner,
+      team: row.team,
+      status: row.status,
+      automate: row.automate,
+      rank: row.rank
+    }))
+
+    return NextResponse.json({ checks })
+  } catch (error) {
+    console.error('Search compliance checks error:', error)
+    return NextResponse.json(
+      { error: 'Failed to search compliance checks' },
+      { status: 500 }
+    )
+  }
+}
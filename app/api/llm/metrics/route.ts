@@ -0,0 +1,9 @@
+import { NextResponse } from 'next/server'
+import { getRouterMetrics } from '@/lib/llm-router'
+
+// Per-instance: each server process routes and measures independently
+export const dynamic = 'force-dynamic'
+
+export async function GET() {
+  return NextResponse.json({ metrics: getRouterMetrics() })
+}
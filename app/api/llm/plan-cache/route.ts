@@ -0,0 +1,25 @@
+import { NextResponse } from 'next/server'
+import { supabaseAdmin } from '@/lib/supabase'
+import { getPlanCacheStats } from '@/lib/plan-cache'
+
+export const dynamic = 'force-dynamic'
+
+// Lookups served by this instance, plus stored entries and hit rates per
+// model and prompt version across all instances
+export async function GET() {
+  try {
+    const { data, error } = await supabaseAdmin
+      .from('collection_plan_cache_stats')
+      .select('*')
+
+    if (error) throw error
+
+    return NextResponse.json({ instance: getPlanCacheStats(), stored: data || [] })
+  } catch (error) {
+    console.error('Get plan cache stats error:', error)
+    return NextResponse.json(
+      { error: 'Failed to fetch plan cache stats' },
+      { status: 500 }
+    )
+  }
+}
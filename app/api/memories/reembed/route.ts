@@ -0,0 +1,32 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { reembedMemories } from '@/lib/agent-memory'
+import { readLimit } from '@/lib/pagination'
+
+// Stops well inside a serverless function timeout; repeat until done
+const TIME_BUDGET_MS = 45 * 1000
+
+// Re-embeds agent memories with the current EMBEDDING_PROVIDER's model, one
+// batch at a time, after switching backends
+export async function POST(request: NextRequest) {
+  try {
+    const { searchParams } = new URL(request.url)
+    const batchSize = readLimit(searchParams.get('batchSize'), 200, 1000)
+    const startedAt = Date.now()
+    let reembedded = 0
+    let done = false
+
+    while (!done && Date.now() - startedAt < TIME_BUDGET_MS) {
+      const count = await reembedMemories(batchSize)
+      reembedded += count
+      done = count === 0
+    }
+
+    return NextResponse.json({ reembedded, done })
+  } catch (error) {
+    console.error('Re-embed memories error:', error)
+    return NextResponse.json(
+      { error: 'Failed to re-embed memories' },
+      { status: 500 }
+    )
+  }
+}
@@ -0,0 +1,180 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { streamText } from 'ai'
+import { supabaseAdmin } from '@/lib/supabase'
+import { getModel } from '@/lib/llm-providers'
+import { getSessionProgress } from '@/lib/progress'
+import { classifyIntent, INTENT_REPLIES } from '@/lib/intent-classifier'
+import { readLimit } from '@/lib/pagination'
+
+// Earlier messages sent to the model as context
+const HISTORY_LIMIT = 20
+
+interface ChatMessage {
+  id: string
+  sender: 'user' | 'ai'
+  message: string
+  timestamp: string
+}
+
+// Messages are rows in session_chat_messages, so saving one never updates
+// evidence_sessions (and never wakes its realtime subscribers)
+async function appendChatMessages(sessionId: string, messages: ChatMessage[]) {
+  const { error } = await supabaseAdmin
+    .from('session_chat_messages')
+    .insert(messages.map(entry => ({
+      id: entry.id,
+      session_id: sessionId,
+      sender: entry.sender,
+      message: entry.message,
+      created_at: entry.timestamp
+    })))
+  if (error) throw error
+}
+
+async function getRecentChatMessages(sessionId: string, limit: number): Promise<ChatMessage[]> {
+  const { data, error } = await supabaseAdmin
+    .from('session_chat_messages')
+    .select('id, sender, message, created_at')
+    .eq('session_id', sessionId)
+    .order('seq', { ascending: false })
+    .limit(limit)
+  if (error) throw error
+
+  return (data || []).reverse().map(row => ({
+    id: row.id,
+    sender: row.sender,
+    message: row.message,
+    timestamp: row.created_at
+  }))
+}
+
+// The conversation so far, oldest first, for the chat panel to show on load
+export async function GET(
+  request: NextRequest,
+  { params }: { params: { id: string } }
+) {
+  try {
+    const { searchParams } = new URL(request.url)
+    const limit = readLimit(searchParams.get('limit'), 100, 500)
+
+    const messages = await getRecentChatMessages(params.id, limit)
+
+    return NextResponse.json({ messages })
+  } catch (error) {
+    console.error('Get chat messages error:', error)
+    return NextResponse.json(
+      { error: 'Failed to fetch chat messages' },
+      { status: 500 }
+    )
+  }
+}
+
+function buildSystemPrompt(session: any, progressSteps: Awaited<ReturnType<typeof getSessionProgress>>) {
+  const current = progressSteps.find(step => step.status === 'in_progress')
+  const completed = progressSteps.filter(step => step.status === 'completed').length
+
+  return `You are an AI evidence collection assistant for compliance audits.
+The user can ask you to change where you search, pause collection, skip a step, or explain what you are doing.
+Answer briefly and concretely.
+
+Session status: ${session.status}
+Progress: ${completed} of ${session.total_steps ?? progressSteps.length} steps completed
+${current ? `Current step: ${current.title} - ${current.message}` : 'No step is currently running.'}`
+}
+
+// Streams the assistant's reply as plain text. Messages the local intent
+// classifier is sure about get a canned reply; the rest go to the model. The
+// user message is stored up front; the reply is stored once, when the stream
+// completes. If the client disconnects the model request is aborted and no
+// partial reply is stored.
+export async function POST(
+  request: NextRequest,
+  { params }: { params: { id: string } }
+) {
+  try {
+    const sessionId = params.id
+    const { message } = await request.json()
+
+    if (typeof message !== 'string' || !message.trim()) {
+      return NextResponse.json({ error: 'Message is required' }, { status: 400 })
+    }
+
+    const { data: session, error } = await supabaseAdmin
+      .from('evidence_sessions')
+      .select('id, status, total_steps')
+      .eq('id', sessionId)
+      .maybeSingle()
+
+    if (error) throw error
+
+    if (!session) {
+      return NextResponse.json({ error: 'Session not found' }, { status: 404 })
+    }
+
+    const userMessage: ChatMessage = {
+      id: crypto.randomUUID(),
+      sender: 'user',
+      message,
+      timestamp: new Date().toISOString()
+    }
+
+    // Short, unambiguous commands are answered locally without a model call
+    const classification = await classifyIntent(message)
+    if (classification.confident && classification.intent) {
+      const reply = INTENT_REPLIES[classification.intent]
+      await appendChatMessages(sessionId, [userMessage, {
+        id: crypto.randomUUID(),
+        sender: 'ai',
+        message: reply,
+        timestamp: new Date().toISOString()
+      }])
+
+      return new Response(reply, {
+        headers: {
+          'Content-Type': 'text/plain; charset=utf-8',
+          'Cache-Control': 'no-cache, no-transform',
+          'X-Chat-Intent': classification.intent
+        }
+      })
+    }
+
+    // Read before storing the new message, which is sent separately below
+    const [history, progressSteps] = await Promise.all([
+      getRecentChatMessages(sessionId, HISTORY_LIMIT),
+      getSessionProgress(sessionId)
+    ])
+    await appendChatMessages(sessionId, [userMessage])
+
+    const result = await streamText({
+      model: getModel(),
+      system: buildSystemPrompt(session, progressSteps),
+      messages: [...history, userMessage].map(entry => ({
+        role: entry.sender === 'user' ? 'user' as const : 'assistant' as const,
+        content: entry.message
+      })),
+      abortSignal: request.signal,
+      onFinish: async ({ text }) => {
+        try {
+          await appendChatMessages(sessionId, [{
+            id: crypto.randomUUID(),
+            sender: 'ai',
+            message: text,
+            timestamp: new Date().toISOString()
+          }])
+        } catch (persistError) {
+          console.error('Chat persist error:', persistError)
+        }
+      }
+    })
+
+    return result.toTextStreamResponse({
+      headers: { 'Cache-Control': 'no-cache, no-transform' }
+    })
+  } catch (error) {
+    console.error('Chat error:', error)
+    return NextResponse.json(
+      { error: 'Failed to process message' },
+      { status: 500 }
+    )
+  }
+}
@@ -0,0 +1,139 @@
+import { NextRequest } from 'next/server'
+import { supabaseAdmin } from '@/lib/supabase'
+import { getSessionProgress, toProgressStep, ProgressStep } from '@/lib/progress'
+
+export const dynamic = 'force-dynamic'
+
+const TERMINAL_STATUSES = ['reviewing', 'completed', 'error']
+const HEARTBEAT_INTERVAL_MS = 25000
+
+// Server-sent progress for one session. Every connect (including an
+// EventSource reconnect) starts from the per-step snapshot, then streams live
+// events. Event ids are assigned at insert time but parallel workers commit
+// out of order, so a single high-water mark could skip an event for good;
+// dedupe is per step instead, where events are written in order.
+export async function GET(
+  request: NextRequest,
+  { params }: { params: { id: string } }
+) {
+  const sessionId = params.id
+  const encoder = new TextEncoder()
+
+  const stream = new ReadableStream({
+    async start(controller) {
+      const sentEventIds = new Map<number, number>()
+      let backfilled = false
+      let closed = false
+      const pending: ProgressStep[] = []
+
+      const send = (event: string, data: unknown) => {
+        if (closed) return
+        controller.enqueue(encoder.encode(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`))
+      }
+
+      const sendProgress = (step: ProgressStep) => {
+        if (!step.eventId || step.eventId <= (sentEventIds.get(step.step) ?? 0)) return
+        sentEventIds.set(step.step, step.eventId)
+        send('progress', step)
+      }
+
+      // session_progress_steps holds the latest committed event per step,
+      // so this catches up regardless of commit order
+      const catchUp = async () => {
+        const steps = await getSessionProgress(sessionId)
+        steps.forEach(sendProgress)
+      }
+
+      const heartbeat = setInterval(() => {
+        if (!closed) controller.enqueue(encoder.encode(': ping\n\n'))
+      }, HEARTBEAT_INTERVAL_MS)
+
+      // Subscribe before the backfill so nothing slips between the two
+      const channel = supabaseAdmin
+        .channel(`session-progress:${sessionId}:${Date.now()}`)
+        .on(
+          'postgres_changes',
+          { event: 'INSERT', schema: 'public', table: 'session_progress_events', filter: `session_id=eq.${sessionId}` },
+          (payload: any) => {
+            const step = toProgressStep(payload.new)
+            if (backfilled) {
+              sendProgress(step)
+            } else {
+              pending.push(step)
+            }
+          }
+        )
+        .on(
+          'postgres_changes',
+          { event: 'UPDATE', schema: 'public', table: 'evidence_sessions', filter: `id=eq.${sessionId}` },
+          (payload: any) => finishIfTerminal(payload.new)
+        )
+
+      const close = () => {
+        if (closed) return
+        closed = true
+        clearInterval(heartbeat)
+        supabaseAdmin.removeChannel(channel)
+        controller.close()
+      }
+
+      const finishIfTerminal = async (session: any) => {
+        const status = { status: session.status, errorMessage: session.error_message }
+        if (!TERMINAL_STATUSES.includes(session.status)) {
+          send('status', status)
+          return
+        }
+
+        // Progress and status arrive on different tables; drain progress
+        // first so the terminal status is always the last event
+        try {
+          await catchUp()
+        } catch (error) {
+          console.error('Progress stream catch-up error:', error)
+        } finally {
+          send('status', status)
+          close()
+        }
+      }
+
+      request.signal.addEventListener('abort', close)
+      controller.enqueue(encoder.encode('retry: 3000\n\n'))
+
+      try {
+        const subscribed = await new Promise<boolean>(resolve => {
+          channel.subscribe((status: string) => resolve(status === 'SUBSCRIBED'))
+        })
+        if (!subscribed) throw new Error('Realtime subscription failed')
+
+        const { data: session, error } = await supabaseAdmin
+          .from('evidence_sessions')
+          .select('status, error_message')
+          .eq('id', sessionId)
+          .single()
+
+        if (error) throw error
+
+        await catchUp()
+        pending.splice(0).forEach(sendProgress)
+        backfilled = true
+
+        if (TERMINAL_STATUSES.includes(session.status)) {
+          await finishIfTerminal(session)
+        }
+      } catch (error) {
+        console.error('Progress stream error:', error)
+        // Closing lets EventSource reconnect and start from a fresh snapshot
+        close()
+      }
+    }
+  })
+
+  return new Response(stream, {
+    headers: {
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache, no-transform',
+      'Connection': 'keep-alive',
+      'X-Accel-Buffering': 'no'
+    }
+  })
+}
@@ -0,0 +1,40 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { supabaseAdmin } from '@/lib/supabase'
+import { getSessionProgress } from '@/lib/progress'
+
+export async function GET(
+  request: NextRequest,
+  { params }: { params: { id: string } }
+) {
+  try {
+    const { data: session, error } = await supabaseAdmin
+      .from('evidence_sessions')
+      .select('id, status, selected_checks, estimated_time_minutes, total_steps, error_message, created_at, completed_at')
+      .eq('id', params.id)
+      .single()
+
+    if (error) throw error
+
+    const progressSteps = await getSessionProgress(params.id)
+
+    return NextResponse.json({
+      session: {
+        id: session.id,
+        status: session.status,
+        progressSteps,
+        selectedChecks: session.selected_checks,
+        estimatedTimeMinutes: session.estimated_time_minutes,
+        totalSteps: session.total_steps,
+        errorMessage: session.error_message,
+        createdAt: session.created_at,
+        completedAt: session.completed_at
+      }
+    })
+  } catch (error) {
+    console.error('Get session error:', error)
+    return NextResponse.json(
+      { error: 'Failed to fetch session' },
+      { status: 500 }
+    )
+  }
+}
@@ -1,6 +1,10 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { supabaseAdmin } from '@/lib/supabase'
 
+// Step progress lives in session_progress_steps (see /api/sessions/[id]);
+// the legacy progress_steps/completed_steps columns are no longer written
+const SESSION_COLUMNS = 'id, admin_user_id, selected_checks, status, total_steps, estimated_time_minutes, actual_time_minutes, error_message, created_at, updated_at, completed_at'
+
 export async function POST(request: NextRequest) {
   try {
     const { selectedChecks, adminUserId } = await request.json()
@@ -16,10 +20,9 @@ export async function POST(request: NextRequest) {
         admin_user_id: adminUserId,
         selected_checks: selectedChecks,
         status: 'pending',
-        progress_steps: [],
         estimated_time_minutes: selectedChecks.length * 5 // 5 min per check estimate
       })
-      .select()
+      .select(SESSION_COLUMNS)
       .single()
 
     if (error) throw error
@@ -39,7 +42,7 @@ export async function GET() {
     const { data: sessions, error } = await supabaseAdmin
       .from('evidence_sessions')
       .select(`
-        *,
+        ${SESSION_COLUMNS},
         evidence_items (
           id,
           status,
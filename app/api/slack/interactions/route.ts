@@ -0,0 +1,58 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { verifySlackSignature } from '@/lib/slack'
+import { evidenceStatusBuffer, isValidEvidenceStatusUpdate, EvidenceStatusUpdate } from '@/lib/evidence'
+
+export async function POST(request: NextRequest) {
+  try {
+    const body = await request.text()
+    const signature = request.headers.get('x-slack-signature') || ''
+    const timestamp = request.headers.get('x-slack-request-timestamp') || ''
+
+    // Verify Slack signature
+    if (!verifySlackSignature(signature, timestamp, body)) {
+      return NextResponse.json({ error: 'Invalid signature' }, { status: 401 })
+    }
+
+    const payload = JSON.parse(new URLSearchParams(body).get('payload') || '{}')
+    const action = payload.actions?.[0]
+
+    if (!action) {
+      return NextResponse.json({ error: 'No action found' }, { status: 400 })
+    }
+
+    const { evidenceId } = JSON.parse(action.value)
+    const userId = payload.user.id
+    const isApproved = action.action_id === 'approve_evidence'
+
+    const update: EvidenceStatusUpdate = {
+      id: evidenceId,
+      status: isApproved ? 'approved' : 'rejected',
+      approver_slack_user_id: userId,
+      approved_at: isApproved ? new Date().toISOString() : null,
+      rejected_at: isApproved ? null : new Date().toISOString()
+    }
+
+    if (!isValidEvidenceStatusUpdate(update)) {
+      return NextResponse.json({ error: 'Invalid evidence id' }, { status: 400 })
+    }
+
+    // Update evidence item. Clicks arriving together are written in one
+    // batch; awaiting keeps the reply after the write is durable.
+    await evidenceStatusBuffer.add(update)
+
+    // Update Slack message
+    const statusText = isApproved ? '✅ Approved' : '❌ Rejected'
+    const responseMessage = {
+      replace_original: true,
+      text: `Evidence ${statusText} by <@${userId}>`
+    }
+
+    return NextResponse.json(responseMessage)
+  } catch (error) {
+    console.error('Slack interaction error:', error)
+    return NextResponse.json(
+      { error: 'Failed to process interaction' },
+      { status: 500 }
+    )
+  }
+}
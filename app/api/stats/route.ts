@@ -0,0 +1,35 @@
+import { NextResponse } from 'next/server'
+import { supabaseAdmin } from '@/lib/supabase'
+
+export async function GET() {
+  try {
+    const { data: counters, error } = await supabaseAdmin
+      .from('dashboard_counters')
+      .select('total_checks, automated_checks, pending_approvals, active_teams, updated_at')
+      .eq('id', 1)
+      .single()
+
+    if (error) throw error
+
+    return NextResponse.json({
+      stats: {
+        totalChecks: counters.total_checks,
+        automatedChecks: counters.automated_checks,
+        pendingApprovals: counters.pending_approvals,
+        activeTeams: counters.active_teams,
+        updatedAt: counters.updated_at
+      }
+    }, {
+      headers: {
+        // Served from the edge cache; a stale copy is returned while it refreshes
+        'Cache-Control': 'public, s-maxage=30, stale-while-revalidate=300'
+      }
+    })
+  } catch (error) {
+    console.error('Get stats error:', error)
+    return NextResponse.json(
+      { error: 'Failed to fetch stats' },
+      { status: 500 }
+    )
+  }
+}
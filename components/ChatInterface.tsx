@@ -12,9 +12,14 @@ export default function ChatInterface({ sessionId }: { sessionId: string }) {
   const [messages, setMessages] = useState<ChatMessage[]>([])
   const [inputValue, setInputValue] = useState('')
   const [isTyping, setIsTyping] = useState(false)
+  const [isResponding, setIsResponding] = useState(false)
+  const [isLoadingHistory, setIsLoadingHistory] = useState(true)
   const messagesEndRef = useRef<HTMLDivElement>(null)
+  const abortRef = useRef<AbortController | null>(null)
 
   useEffect(() => {
+    const controller = new AbortController()
+
     // Initialize with welcome message
     setMessages([
       {
@@ -24,64 +29,113 @@ export default function ChatInterface({ sessionId }: { sessionId: string }) {
         timestamp: new Date().toISOString()
       }
     ])
-  }, [])
+    setIsLoadingHistory(true)
+
+    // Then the conversation so far in this session, oldest first. Sending is
+    // disabled until it arrives so new messages always follow it.
+    const loadHistory = async () => {
+      try {
+        const response = await fetch(`/api/sessions/${sessionId}/chat`, { signal: controller.signal })
+        if (!response.ok) {
+          throw new Error(`Chat history request failed: ${response.status}`)
+        }
+        const { messages: history }: { messages: ChatMessage[] } = await response.json()
+        setMessages(prev => [...prev, ...history])
+      } catch (error) {
+        if (!controller.signal.aborted) console.error('Chat history error:', error)
+      } finally {
+        if (!controller.signal.aborted) setIsLoadingHistory(false)
+      }
+    }
+
+    loadHistory()
+    return () => controller.abort()
+  }, [sessionId])
 
   useEffect(() => {
     scrollToBottom()
   }, [messages])
 
+  // Leaving the page cancels an in-flight reply (and the model request behind it)
+  useEffect(() => {
+    return () => abortRef.current?.abort()
+  }, [])
+
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' })
   }
 
   const sendMessage = async () => {
-    if (!inputValue.trim()) return
+    const text = inputValue.trim()
+    if (!text || isResponding || isLoadingHistory) return
 
     const userMessage: ChatMessage = {
       id: Date.now().toString(),
       sender: 'user',
-      message: inputValue,
+      message: text,
       timestamp: new Date().toISOString()
     }
 
     setMessages(prev => [...prev, userMessage])
     setInputValue('')
     setIsTyping(true)
-
-    // Simulate AI response
-    setTimeout(() => {
-      const aiResponse: ChatMessage = {
-        id: (Date.now() + 1).toString(),
-        sender: 'ai',
-        message: getAIResponse(inputValue),
-        timestamp: new Date().toISOString()
+    setIsResponding(true)
+
+    const controller = new AbortController()
+    abortRef.current = controller
+    const aiMessageId = (Date.now() + 1).toString()
+
+    try {
+      const response = await fetch(`/api/sessions/${sessionId}/chat`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ message: text }),
+        signal: controller.signal
+      })
+
+      if (!response.ok || !response.body) {
+        throw new Error(`Chat request failed: ${response.status}`)
       }
 
-      setMessages(prev => [...prev, aiResponse])
+      // Show tokens as they arrive; the typing indicator only covers the
+      // wait for the first one
+      const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+      let started = false
+
+      while (true) {
+        const { done, value } = await reader.read()
+        if (done) break
+
+        if (!started) {
+          started = true
+          setIsTyping(false)
+          setMessages(prev => [...prev, {
+            id: aiMessageId,
+            sender: 'ai',
+            message: value,
+            timestamp: new Date().toISOString()
+          }])
+        } else {
+          setMessages(prev => prev.map(message =>
+            message.id === aiMessageId ? { ...message, message: message.message + value } : message
+          ))
+        }
+      }
+    } catch (error) {
+      if (!controller.signal.aborted) {
+        console.error('Chat error:', error)
+        setMessages(prev => [...prev, {
+          id: aiMessageId,
+          sender: 'ai',
+          message: 'Sorry, I couldn\'t respond just now. Please try again.',
+          timestamp: new Date().toISOString()
+        }])
+      }
+    } finally {
       setIsTyping(false)
-    }, 1500)
-  }
-
-  const getAIResponse = (userInput: string): string => {
-    const input = userInput.toLowerCase()
-
-    if (input.includes('folder') || input.includes('path')) {
-      return 'I\'ll update the collection path. Which specific folder should I look in instead? I can search Google Drive, OneDrive, or local network shares.'
-    }
-
-    if (input.includes('stop') || input.includes('pause')) {
-      return 'I\'ve paused the current evidence collection. You can resume anytime or modify the approach. What would you like to change?'
+      setIsResponding(false)
+      abortRef.current = null
     }
-
-    if (input.includes('help') || input.includes('what can')) {
-      return 'I can help you with:\n\n• Modifying evidence collection steps\n• Changing search locations and patterns\n• Updating file filtering criteria\n• Explaining what I\'m doing and why\n• Pausing or adjusting the collection process\n\nJust tell me what you\'d like to change!'
-    }
-
-    if (input.includes('why') || input.includes('explain')) {
-      return 'I\'m collecting evidence based on the compliance check requirements and learned patterns. For this check, I\'m looking for recent files that match the expected naming conventions and contain the required data elements. Would you like me to adjust my search criteria?'
-    }
-
-    return 'I understand. Let me adjust my approach accordingly. I\'ll update my collection strategy and continue with the modified parameters. You can always ask me to explain what I\'m doing or make further changes.'
   }
 
   const handleKeyPress = (e: React.KeyboardEvent) => {
@@ -174,11 +228,11 @@ export default function ChatInterface({ sessionId }: { sessionId: string }) {
             onKeyPress={handleKeyPress}
             placeholder="Type your message..."
             className="flex-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500 text-sm"
-            disabled={isTyping}
+            disabled={isResponding || isLoadingHistory}
           />
           <button
             onClick={sendMessage}
-            disabled={!inputValue.trim() || isTyping}
+            disabled={!inputValue.trim() || isResponding || isLoadingHistory}
             className="inline-flex items-center px-3 py-2 border border-transparent text-sm leading-4 font-medium rounded-md text-white bg-primary-600 hover:bg-primary-700 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-primary-500 disabled:opacity-50 disabled:cursor-not-allowed"
           >
             <PaperAirplaneIcon className="h-4 w-4" />
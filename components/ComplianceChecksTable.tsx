@@ -1,4 +1,5 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef, useCallback, memo } from 'react'
+import { useVirtualizer } from '@tanstack/react-virtual'
 import { CheckIcon, XMarkIcon } from '@heroicons/react/20/solid'
 
 interface ComplianceCheck {
@@ -17,66 +18,197 @@ interface ComplianceCheck {
   spocComments?: string
 }
 
+const PAGE_SIZE = 100
+const ROW_HEIGHT = 64
+// Start fetching the next page this many rows before the end is visible
+const PREFETCH_ROWS = 20
+
+const getStatusBadge = (status: string) => {
+  const baseClasses = 'inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium'
+
+  switch ((status || '').toLowerCase()) {
+    case 'pending':
+      return `${baseClasses} bg-yellow-100 text-yellow-800`
+    case 'in progress':
+      return `${baseClasses} bg-blue-100 text-blue-800`
+    case 'completed':
+      return `${baseClasses} bg-green-100 text-green-800`
+    case 'approved':
+      return `${baseClasses} bg-green-100 text-green-800`
+    default:
+      return `${baseClasses} bg-gray-100 text-gray-800`
+  }
+}
+
+// Memoized so toggling one checkbox re-renders only that row
+const CheckRow = memo(function CheckRow({
+  check,
+  selected,
+  onToggle
+}: {
+  check: ComplianceCheck
+  selected: boolean
+  onToggle: (checkId: string) => void
+}) {
+  return (
+    <tr className="hover:bg-gray-50" style={{ height: ROW_HEIGHT }}>
+      <td className="px-6 py-4 whitespace-nowrap">
+        <input
+          type="checkbox"
+          checked={selected}
+          onChange={() => onToggle(check.id)}
+          className="rounded border-gray-300 text-primary-600 focus:ring-primary-500"
+        />
+      </td>
+      <td className="px-6 py-2">
+        <div className="truncate">
+          <div className="text-sm font-medium text-gray-900 truncate">
+            {check.checkName}
+          </div>
+          <div className="text-sm text-gray-500 truncate">
+            {check.checkType}
+          </div>
+        </div>
+      </td>
+      <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-900">
+        {check.area}
+      </td>
+      <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-900">
+        {check.owner}
+      </td>
+      <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-900">
+        {check.team}
+      </td>
+      <td className="px-6 py-4 whitespace-nowrap">
+        <span className={getStatusBadge(check.status)}>
+          {check.status}
+        </span>
+      </td>
+      <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-900">
+        {check.automate ? (
+          <CheckIcon className="h-5 w-5 text-green-500" />
+        ) : (
+          <XMarkIcon className="h-5 w-5 text-red-500" />
+        )}
+      </td>
+    </tr>
+  )
+})
+
 export default function ComplianceChecksTable() {
   const [checks, setChecks] = useState<ComplianceCheck[]>([])
-  const [selectedChecks, setSelectedChecks] = useState<string[]>([])
+  const [selectedChecks, setSelectedChecks] = useState<Set<string>>(() => new Set())
   const [filters, setFilters] = useState({
     team: 'all',
     status: 'all',
     checkType: 'all'
   })
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [total, setTotal] = useState<number | null>(null)
+  // The request in flight; a filter change aborts it so a page fetched for the
+  // old filters is never appended to the new list
+  const requestRef = useRef<AbortController | null>(null)
 
   useEffect(() => {
+    // Selections made under other filters may not be visible any more
+    setSelectedChecks(new Set())
+    setNextCursor(null)
     fetchChecks()
   }, [filters])
 
-  const fetchChecks = async () => {
+  useEffect(() => () => requestRef.current?.abort(), [])
+
+  const fetchChecks = async (cursor?: string) => {
+    if (cursor && requestRef.current) return
+    requestRef.current?.abort()
+    const controller = new AbortController()
+    requestRef.current = controller
+
     try {
-      setLoading(true)
-      const params = new URLSearchParams()
+      if (cursor) {
+        setLoadingMore(true)
+      } else {
+        setLoading(true)
+      }
+      const params = new URLSearchParams({ limit: String(PAGE_SIZE) })
       if (filters.team !== 'all') params.set('team', filters.team)
       if (filters.status !== 'all') params.set('status', filters.status)
       if (filters.checkType !== 'all') params.set('checkType', filters.checkType)
+      if (cursor) {
+        params.set('cursor', cursor)
+      } else {
+        params.set('count', 'estimated')
+      }
 
-      const response = await fetch(`/api/compliance?${params}`)
+      const response = await fetch(`/api/compliance?${params}`, { signal: controller.signal })
       const data = await response.json()
 
-      if (data.checks) {
-        setChecks(data.checks)
+      if (data.checks && !controller.signal.aborted) {
+        setChecks(prev => cursor ? [...prev, ...data.checks] : data.checks)
+        setNextCursor(data.nextCursor)
+        if (!cursor) setTotal(data.total ?? null)
       }
     } catch (error) {
-      console.error('Failed to fetch checks:', error)
+      if (!controller.signal.aborted) console.error('Failed to fetch checks:', error)
     } finally {
-      setLoading(false)
+      if (requestRef.current === controller) {
+        requestRef.current = null
+        setLoading(false)
+        setLoadingMore(false)
+      }
     }
   }
 
-  const handleSelectCheck = (checkId: string) => {
-    setSelectedChecks(prev => 
-      prev.includes(checkId) 
-        ? prev.filter(id => id !== checkId)
-        : [...prev, checkId]
-    )
-  }
+  const handleSelectCheck = useCallback((checkId: string) => {
+    setSelectedChecks(prev => {
+      const next = new Set(prev)
+      if (next.has(checkId)) {
+        next.delete(checkId)
+      } else {
+        next.add(checkId)
+      }
+      return next
+    })
+  }, [])
+
+  // Select-all covers the rows loaded so far, not every row matching the filters
+  const allSelected = checks.length > 0 && checks.every(check => selectedChecks.has(check.id))
 
   const handleSelectAll = () => {
-    setSelectedChecks(
-      selectedChecks.length === checks.length 
-        ? [] 
-        : checks.map(check => check.id)
-    )
+    setSelectedChecks(prev => {
+      const next = new Set(prev)
+      checks.forEach(check => allSelected ? next.delete(check.id) : next.add(check.id))
+      return next
+    })
   }
 
+  const scrollRef = useRef<HTMLDivElement>(null)
+  const virtualizer = useVirtualizer({
+    count: checks.length,
+    getScrollElement: () => scrollRef.current,
+    estimateSize: () => ROW_HEIGHT,
+    overscan: 10
+  })
+  const virtualRows = virtualizer.getVirtualItems()
+  const lastVisibleIndex = virtualRows.length > 0 ? virtualRows[virtualRows.length - 1].index : -1
+
+  useEffect(() => {
+    if (nextCursor && !loadingMore && lastVisibleIndex >= checks.length - PREFETCH_ROWS) {
+      fetchChecks(nextCursor)
+    }
+  }, [lastVisibleIndex, nextCursor, loadingMore, checks.length])
+
   const startCollection = async () => {
-    if (selectedChecks.length === 0) return
+    if (selectedChecks.size === 0) return
 
     try {
       const response = await fetch('/api/sessions', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
-          selectedChecks,
+          selectedChecks: Array.from(selectedChecks),
           adminUserId: 'current-user-id' // Replace with actual user ID
         })
       })
@@ -90,23 +222,6 @@ export default function ComplianceChecksTable() {
     }
   }
 
-  const getStatusBadge = (status: string) => {
-    const baseClasses = 'inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium'
-
-    switch (status.toLowerCase()) {
-      case 'pending':
-        return `${baseClasses} bg-yellow-100 text-yellow-800`
-      case 'in progress':
-        return `${baseClasses} bg-blue-100 text-blue-800`
-      case 'completed':
-        return `${baseClasses} bg-green-100 text-green-800`
-      case 'approved':
-        return `${baseClasses} bg-green-100 text-green-800`
-      default:
-        return `${baseClasses} bg-gray-100 text-gray-800`
-    }
-  }
-
   if (loading) {
     return (
       <div className="animate-pulse">
@@ -164,29 +279,35 @@ export default function ComplianceChecksTable() {
       {/* Actions */}
       <div className="flex items-center justify-between">
         <div className="text-sm text-gray-500">
-          {selectedChecks.length} of {checks.length} checks selected
+          {selectedChecks.size} selected · {checks.length} of {total ?? checks.length} checks loaded
         </div>
 
-        {selectedChecks.length > 0 && (
+        {selectedChecks.size > 0 && (
           <button
             onClick={startCollection}
             className="btn btn-primary"
           >
-            Start Collection ({selectedChecks.length})
+            Start Collection ({selectedChecks.size})
           </button>
         )}
       </div>
 
-      {/* Table */}
-      <div className="overflow-hidden shadow ring-1 ring-black ring-opacity-5 rounded-lg">
+      {/* Table: only the rows in view (plus overscan) are in the DOM */}
+      <div
+        ref={scrollRef}
+        className="overflow-auto shadow ring-1 ring-black ring-opacity-5 rounded-lg"
+        style={{ maxHeight: 640 }}
+      >
         <table className="min-w-full divide-y divide-gray-300">
-          <thead className="bg-gray-50">
+          <thead className="bg-gray-50 sticky top-0 z-10">
             <tr>
               <th className="px-6 py-3 text-left">
                 <input
                   type="checkbox"
-                  checked={selectedChecks.length === checks.length && checks.length > 0}
+                  checked={allSelected}
                   onChange={handleSelectAll}
+                  title="Select all loaded rows"
+                  aria-label="Select all loaded rows"
                   className="rounded border-gray-300 text-primary-600 focus:ring-primary-500"
                 />
               </th>
@@ -211,52 +332,30 @@ export default function ComplianceChecksTable() {
             </tr>
           </thead>
           <tbody className="bg-white divide-y divide-gray-200">
-            {checks.map((check) => (
-              <tr key={check.id} className="hover:bg-gray-50">
-                <td className="px-6 py-4 whitespace-nowrap">
-                  <input
-                    type="checkbox"
-                    checked={selectedChecks.includes(check.id)}
-                    onChange={() => handleSelectCheck(check.id)}
-                    className="rounded border-gray-300 text-primary-600 focus:ring-primary-500"
-                  />
-                </td>
-                <td className="px-6 py-4">
-                  <div>
-                    <div className="text-sm font-medium text-gray-900">
-                      {check.checkName}
-                    </div>
-                    <div className="text-sm text-gray-500">
-                      {check.checkType}
-                    </div>
-                  </div>
-                </td>
-                <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-900">
-                  {check.area}
-                </td>
-                <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-900">
-                  {check.owner}
-                </td>
-                <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-900">
-                  {check.team}
-                </td>
-                <td className="px-6 py-4 whitespace-nowrap">
-                  <span className={getStatusBadge(check.status)}>
-                    {check.status}
-                  </span>
-                </td>
-                <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-900">
-                  {check.automate ? (
-                    <CheckIcon className="h-5 w-5 text-green-500" />
-                  ) : (
-                    <XMarkIcon className="h-5 w-5 text-red-500" />
-                  )}
-                </td>
-              </tr>
-            ))}
+            {virtualRows.length > 0 && virtualRows[0].start > 0 && (
+              <tr style={{ height: virtualRows[0].start }} />
+            )}
+            {virtualRows.map((virtualRow) => {
+              const check = checks[virtualRow.index]
+              return (
+                <CheckRow
+                  key={check.id}
+                  check={check}
+                  selected={selectedChecks.has(check.id)}
+                  onToggle={handleSelectCheck}
+                />
+              )
+            })}
+            {virtualRows.length > 0 && (
+              <tr style={{ height: virtualizer.getTotalSize() - virtualRows[virtualRows.length - 1].end }} />
+            )}
           </tbody>
         </table>
       </div>
+
+      {loadingMore && (
+        <div className="text-center text-sm text-gray-500">Loading more checks...</div>
+      )}
     </div>
   )
 }
@@ -9,15 +9,22 @@ export default function DashboardStats() {
   })
 
   useEffect(() => {
-    // Simulate loading stats
-    setStats({
-      totalChecks: 25,
-      automatedChecks: 18,
-      pendingApprovals: 7,
-      activeTeams: 4
-    })
+    fetchStats()
   }, [])
 
+  const fetchStats = async () => {
+    try {
+      const response = await fetch('/api/stats')
+      const data = await response.json()
+
+      if (data.stats) {
+        setStats(data.stats)
+      }
+    } catch (error) {
+      console.error('Failed to fetch stats:', error)
+    }
+  }
+
   const statCards = [
     { 
       name: 'Total Checks', 
@@ -9,9 +9,10 @@ import {
 interface ProgressStep {
   step: number
   title: string
-  status: 'pending' | 'in_progress' | 'completed' | 'error'
+  status: 'pending' | 'in_progress' | 'completed' | 'error' | 'skipped'
   message: string
   timestamp?: string
+  eventId?: number
 }
 
 interface EvidenceSession {
@@ -22,18 +23,50 @@ interface EvidenceSession {
   estimatedTimeMinutes?: number
 }
 
+const TERMINAL_STATUSES = ['reviewing', 'completed', 'error']
+
+const applyProgress = (steps: ProgressStep[], update: ProgressStep) => {
+  const existing = steps.find(step => step.step === update.step)
+  if (existing?.eventId && update.eventId && existing.eventId >= update.eventId) {
+    return steps
+  }
+  return [...steps.filter(step => step.step !== update.step), update]
+    .sort((a, b) => a.step - b.step)
+}
+
 export default function EvidenceCollectionInterface({ sessionId }: { sessionId: string }) {
   const [session, setSession] = useState<EvidenceSession | null>(null)
   const [loading, setLoading] = useState(true)
 
+  const isLive = !!session && !TERMINAL_STATUSES.includes(session.status)
+
   useEffect(() => {
     fetchSession()
-
-    // Set up real-time updates
-    const interval = setInterval(fetchSession, 2000)
-    return () => clearInterval(interval)
   }, [sessionId])
 
+  useEffect(() => {
+    if (!isLive) return
+
+    // Real-time updates: each (re)connect replays the current state of every
+    // step, then live changes; applyProgress keeps the newest event per step
+    const source = new EventSource(`/api/sessions/${sessionId}/events`)
+
+    source.addEventListener('progress', (event) => {
+      const step: ProgressStep = JSON.parse((event as MessageEvent).data)
+      setSession(prev => prev && {
+        ...prev,
+        progressSteps: applyProgress(prev.progressSteps, step)
+      })
+    })
+
+    source.addEventListener('status', (event) => {
+      const { status } = JSON.parse((event as MessageEvent).data)
+      setSession(prev => prev && { ...prev, status })
+    })
+
+    return () => source.close()
+  }, [sessionId, isLive])
+
   const fetchSession = async () => {
     try {
       const response = await fetch(`/api/sessions/${sessionId}`)
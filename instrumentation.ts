@@ -0,0 +1,13 @@
+// Runs once when a server instance starts
+export async function register() {
+  if (process.env.NEXT_RUNTIME !== 'nodejs') return
+
+  const { getProviderNames, getOllamaModelId } = await import('./lib/llm-providers')
+  if (!getProviderNames().includes('ollama')) return
+
+  // Load the local model before the first request needs it
+  const { warmOllamaModel } = await import('./lib/ollama')
+  warmOllamaModel(getOllamaModelId())
+    .then(({ modelId, durationMs }) => console.log(`Warmed Ollama model ${modelId} in ${durationMs}ms`))
+    .catch(error => console.error('Ollama warm-up error:', error))
+}
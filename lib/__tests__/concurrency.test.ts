@@ -0,0 +1,70 @@
+import { describe, expect, it } from 'vitest'
+import { createLimiter, runPool } from '../concurrency'
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms))
+
+// Runs tasks through the limiter and reports the most that were ever running at once
+function trackConcurrency() {
+  let running = 0
+  let maxRunning = 0
+  const task = (until: number | Promise<unknown>) => async () => {
+    running++
+    maxRunning = Math.max(maxRunning, running)
+    await (typeof until === 'number' ? sleep(until) : until)
+    running--
+  }
+  return { task, max: () => maxRunning }
+}
+
+describe('createLimiter', () => {
+  it('never runs more tasks than the limit', async () => {
+    const limit = createLimiter(3)
+    const { task, max } = trackConcurrency()
+
+    await Promise.all(Array.from({ length: 20 }, (_, i) => limit(task(1 + (i % 4)))))
+
+    expect(max()).toBe(3)
+  })
+
+  it('keeps the limit when a caller arrives as a slot is handed over', async () => {
+    const limit = createLimiter(1)
+    const { task, max } = trackConcurrency()
+    let finishFirst!: () => void
+    const firstDone = new Promise<void>(resolve => { finishFirst = () => resolve() })
+
+    const calls = [limit(task(firstDone)), limit(task(20))]
+    // Callers arriving a few microtasks after the first task ends, i.e. while
+    // its slot is passing to the queued second task
+    for (let delay = 0; delay < 6; delay++) {
+      let arrival: Promise<void> = firstDone
+      for (let i = 0; i < delay; i++) arrival = arrival.then(() => undefined)
+      calls.push(arrival.then(() => limit(task(20))))
+    }
+
+    finishFirst()
+    await Promise.all(calls)
+
+    expect(max()).toBe(1)
+  })
+
+  it('releases the slot when a task fails', async () => {
+    const limit = createLimiter(1)
+
+    await expect(limit(async () => { throw new Error('boom') })).rejects.toThrow('boom')
+    await expect(limit(async () => 'next')).resolves.toBe('next')
+  })
+})
+
+describe('runPool', () => {
+  it('keeps input order and bounds concurrency', async () => {
+    const { task, max } = trackConcurrency()
+
+    const results = await runPool([30, 10, 20, 5], 2, async (ms, index) => {
+      await task(ms)()
+      return index
+    })
+
+    expect(results).toEqual([0, 1, 2, 3])
+    expect(max()).toBe(2)
+  })
+})
@@ -0,0 +1,126 @@
+import { beforeEach, describe, expect, it, vi } from 'vitest'
+
+// The sync runs entirely against the in-memory source and store
+vi.mock('../supabase', () => ({ supabaseAdmin: {} }))
+vi.mock('../google-drive', () => ({ drive: {}, iterateFiles: vi.fn() }))
+
+import { globToLikePattern, latestChangePerFile, syncDriveIndex } from '../drive-index'
+import { MemoryDriveChanges, MemoryDriveIndexStore } from './memory-drive-index'
+
+const file = (id: string, name = `${id}.xlsx`) => ({
+  id,
+  name,
+  mimeType: 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+  modifiedTime: '2025-09-01T00:00:00.000Z',
+  parents: ['folder-1']
+})
+
+describe('syncDriveIndex', () => {
+  let source: MemoryDriveChanges
+  let store: MemoryDriveIndexStore
+
+  beforeEach(() => {
+    source = new MemoryDriveChanges(2)
+    store = new MemoryDriveIndexStore()
+  })
+
+  it('seeds the index from a full listing on the first run', async () => {
+    source.putFile(file('a'))
+    source.putFile(file('b'))
+    source.putFile(file('c'))
+    source.trashFile('c')
+
+    const result = await syncDriveIndex(source, 'default', store)
+
+    expect(result).toEqual({ seeded: true, upserted: 2, removed: 0 })
+    expect(Array.from(store.files.keys()).sort()).toEqual(['a', 'b'])
+    expect(store.pageTokens.get('default')).toBe(await source.getStartPageToken())
+  })
+
+  it('applies only the changes made since the saved token', async () => {
+    source.putFile(file('a'))
+    await syncDriveIndex(source, 'default', store)
+
+    source.putFile(file('b'))
+    source.putFile(file('a', 'renamed.xlsx'))
+    source.putFile(file('c'))
+
+    const result = await syncDriveIndex(source, 'default', store)
+
+    expect(result).toEqual({ seeded: false, upserted: 3, removed: 0 })
+    expect(store.files.get('a')?.name).toBe('renamed.xlsx')
+    expect(Array.from(store.files.keys()).sort()).toEqual(['a', 'b', 'c'])
+  })
+
+  it('drops removed and trashed files from the index', async () => {
+    source.putFile(file('a'))
+    source.putFile(file('b'))
+    source.putFile(file('c'))
+    await syncDriveIndex(source, 'default', store)
+
+    source.removeFile('a')
+    source.trashFile('b')
+
+    const result = await syncDriveIndex(source, 'default', store)
+
+    expect(result).toEqual({ seeded: false, upserted: 0, removed: 2 })
+    expect(Array.from(store.files.keys())).toEqual(['c'])
+  })
+
+  it('keeps a file that was removed and restored within one page', async () => {
+    source.putFile(file('a'))
+    await syncDriveIndex(source, 'default', store)
+
+    source.removeFile('a')
+    source.putFile(file('a'))
+
+    await syncDriveIndex(source, 'default', store)
+
+    expect(store.files.has('a')).toBe(true)
+  })
+
+  it('persists newStartPageToken after paging through every change', async () => {
+    await syncDriveIndex(source, 'default', store)
+
+    for (const id of ['a', 'b', 'c', 'd', 'e']) source.putFile(file(id))
+    await syncDriveIndex(source, 'default', store)
+
+    expect(store.pageTokens.get('default')).toBe('5')
+
+    // Nothing new: the saved token yields an empty page
+    const result = await syncDriveIndex(source, 'default', store)
+    expect(result).toEqual({ seeded: false, upserted: 0, removed: 0 })
+  })
+
+  it('keeps a separate position per drive key', async () => {
+    source.putFile(file('a'))
+    await syncDriveIndex(source, 'shared', store)
+
+    expect(store.pageTokens.get('shared')).toBe('1')
+    expect(store.pageTokens.has('default')).toBe(false)
+  })
+})
+
+describe('latestChangePerFile', () => {
+  it('keeps the last change for each file', () => {
+    const changes = latestChangePerFile([
+      { fileId: 'a', removed: true },
+      { fileId: 'b', file: file('b') },
+      { fileId: 'a', file: file('a') }
+    ])
+
+    expect(changes.map(change => change.fileId)).toEqual(['b', 'a'])
+    expect(changes[1].removed).toBeUndefined()
+  })
+})
+
+describe('globToLikePattern', () => {
+  it('maps glob wildcards to LIKE wildcards', () => {
+    expect(globToLikePattern('AD_User_Report_*FINAL*.xlsx')).toBe('AD\\_User\\_Report\\_%FINAL%.xlsx')
+    expect(globToLikePattern('backup-202?.tar')).toBe('backup-202_.tar')
+  })
+
+  it('escapes LIKE metacharacters that are literal in the glob', () => {
+    expect(globToLikePattern('100%_done\\x')).toBe('100\\%\\_done\\\\x')
+  })
+})
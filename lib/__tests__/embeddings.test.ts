@@ -0,0 +1,107 @@
+import { describe, expect, it, vi } from 'vitest'
+
+vi.mock('../llm-providers', () => ({ getEmbeddingModel: vi.fn() }))
+
+import { createEmbeddingService, createHashEmbedder, fitToColumn } from '../embeddings'
+
+// The offline hash embedder, with every provider request recorded
+function countingEmbedder(maxBatchSize = Infinity) {
+  const inner = createHashEmbedder(16)
+  const embed = vi.fn((texts: string[]) => inner.embed(texts))
+  return { ...inner, maxBatchSize, embed }
+}
+
+describe('createEmbeddingService', () => {
+  it('batches calls that arrive within the window', async () => {
+    const embedder = countingEmbedder()
+    const service = createEmbeddingService(embedder, { batchWindowMs: 5 })
+
+    const [first, second] = await Promise.all([service.embed('access review'), service.embed('backup policy')])
+
+    expect(embedder.embed).toHaveBeenCalledTimes(1)
+    expect(embedder.embed).toHaveBeenCalledWith(['access review', 'backup policy'])
+    expect([first, second]).toEqual(await createHashEmbedder(16).embed(['access review', 'backup policy']))
+  })
+
+  it('splits a batch at the embedder limit', async () => {
+    const embedder = countingEmbedder(3)
+    const service = createEmbeddingService(embedder, { batchWindowMs: 5 })
+    const texts = Array.from({ length: 7 }, (_, i) => `check ${i}`)
+
+    const vectors = await service.embedMany(texts)
+
+    expect(embedder.embed.mock.calls.map(([batch]) => batch.length)).toEqual([3, 3, 1])
+    expect(vectors).toEqual(await createHashEmbedder(16).embed(texts))
+    expect(service.getStats().requests).toBe(3)
+  })
+
+  it('embeds identical texts once', async () => {
+    const embedder = countingEmbedder()
+    const service = createEmbeddingService(embedder)
+
+    const [a, b, c] = await service.embedMany(['firewall rules', 'firewall rules', 'user access'])
+
+    expect(embedder.embed).toHaveBeenCalledWith(['firewall rules', 'user access'])
+    expect(a).toBe(b)
+    expect(c).not.toEqual(a)
+    expect(service.getStats()).toEqual({ hits: 1, misses: 2, requests: 1 })
+  })
+
+  it('answers repeated texts from the cache', async () => {
+    const embedder = countingEmbedder()
+    const service = createEmbeddingService(embedder)
+
+    const first = await service.embed('patch compliance')
+    const again = await service.embed('patch compliance')
+
+    expect(again).toBe(first)
+    expect(embedder.embed).toHaveBeenCalledTimes(1)
+    expect(service.getStats()).toEqual({ hits: 1, misses: 1, requests: 1 })
+  })
+
+  it('evicts the least recently used vector when the cache is full', async () => {
+    const embedder = countingEmbedder()
+    const service = createEmbeddingService(embedder, { cacheSize: 2 })
+
+    await service.embed('a')
+    await service.embed('b')
+    await service.embed('a')
+    await service.embed('c')
+    embedder.embed.mockClear()
+
+    // 'b' was the least recently used when 'c' came in
+    await service.embed('a')
+    await service.embed('c')
+    expect(embedder.embed).not.toHaveBeenCalled()
+    await service.embed('b')
+    expect(embedder.embed).toHaveBeenCalledWith(['b'])
+  })
+
+  it('rejects the whole batch on a provider error without caching it', async () => {
+    const embedder = countingEmbedder()
+    embedder.embed.mockImplementationOnce(async () => {
+      throw new Error('rate limited')
+    })
+    const service = createEmbeddingService(embedder)
+
+    const results = await Promise.allSettled([service.embed('one'), service.embed('two')])
+    expect(results.map(result => result.status)).toEqual(['rejected', 'rejected'])
+
+    await expect(service.embed('one')).resolves.toHaveLength(16)
+    expect(embedder.embed).toHaveBeenCalledTimes(2)
+  })
+})
+
+describe('fitToColumn', () => {
+  it('zero-pads narrower vectors to the column width', async () => {
+    const fitted = fitToColumn(createHashEmbedder(16), 20)
+    const [vector] = await fitted.embed(['evidence'])
+
+    expect(fitted.dimensions).toBe(20)
+    expect(vector.slice(16)).toEqual([0, 0, 0, 0])
+  })
+
+  it('rejects models wider than the column', () => {
+    expect(() => fitToColumn(createHashEmbedder(32), 16)).toThrow('produces 32 dimensions')
+  })
+})
@@ -0,0 +1,100 @@
+import { describe, expect, it, vi } from 'vitest'
+
+vi.mock('../llm-providers', () => ({ getEmbeddingModel: vi.fn() }))
+
+import { classifyIntent, INTENT_REPLIES } from '../intent-classifier'
+
+describe('classifyIntent', () => {
+  it.each([
+    ['Change the search folder', 'change_folder'],
+    ['Explain what you\'re doing', 'explain'],
+    ['Pause collection', 'pause'],
+    ['Skip this step', 'skip_step'],
+    ['Help', 'help']
+  ])('answers the quick action "%s" locally', async (message, intent) => {
+    const result = await classifyIntent(message)
+
+    expect(result).toMatchObject({ intent, confident: true })
+    expect(INTENT_REPLIES[result.intent!]).toBeTruthy()
+  })
+
+  it.each([
+    'hold on',
+    'look in a different folder please',
+    'go to the next check'
+  ])('answers the paraphrase "%s" locally', async (message) => {
+    expect((await classifyIntent(message)).confident).toBe(true)
+  })
+
+  it('is not confident when a keyword names a different intent than the nearest example', async () => {
+    // Nearest example is "Explain this step"; "stop" points at pause
+    const result = await classifyIntent('stop this step')
+
+    expect(result.intent).toBe('explain')
+    expect(result.confidence).toBeGreaterThanOrEqual(0.5)
+    expect(result.confident).toBe(false)
+  })
+
+  it.each([
+    'explain this step and skip it',
+    'skip this folder'
+  ])('is not confident when "%s" names two intents', async (message) => {
+    expect((await classifyIntent(message)).confident).toBe(false)
+  })
+
+  it.each([
+    'folder',
+    'explain the folder',
+    'next step please'
+  ])('does not let the keyword in "%s" decide on its own', async (message) => {
+    const result = await classifyIntent(message)
+
+    expect(result.confidence).toBeLessThan(0.5)
+    expect(result.confident).toBe(false)
+  })
+
+  it.each([
+    'don\'t pause',
+    'do not skip this step',
+    'never stop collecting',
+    'should I skip?',
+    'can you pause collection',
+    'what folder are you searching'
+  ])('sends "%s" to the model', async (message) => {
+    expect((await classifyIntent(message)).confident).toBe(false)
+  })
+
+  it('sends long messages to the model even when they match', async () => {
+    const result = await classifyIntent('pause collection until the HR folder for 2024 has been shared with us')
+
+    expect(result.confident).toBe(false)
+  })
+
+  it.each([
+    'thanks',
+    'hello there',
+    'the report is late'
+  ])('falls through on unrelated messages like "%s"', async (message) => {
+    const result = await classifyIntent(message)
+
+    expect(result.confident).toBe(false)
+    expect(result.confidence).toBeLessThan(0.5)
+  })
+
+  it('classifies in under 5ms once warm', async () => {
+    const messages = [
+      'Pause collection', 'skip it', 'explain this step', 'look in another folder',
+      'what are you doing?', 'thanks', 'please find the Q3 access review export', 'help'
+    ]
+    // The first call in a process pays for JIT compilation
+    await classifyIntent('warm up')
+
+    const elapsed: number[] = []
+    for (let i = 0; i < 200; i++) {
+      elapsed.push((await classifyIntent(messages[i % messages.length])).elapsedMs)
+    }
+    elapsed.sort((a, b) => a - b)
+
+    expect(elapsed[Math.floor(elapsed.length * 0.95)]).toBeLessThan(5)
+  })
+})
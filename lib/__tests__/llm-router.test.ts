@@ -0,0 +1,228 @@
+import { afterEach, describe, expect, it, vi } from 'vitest'
+import { APICallError, type LanguageModel } from 'ai'
+import { createLimiter } from '../concurrency'
+import { createRoutedModel, getRouterMetrics, rankProviders } from '../llm-router'
+
+type GenerateOptions = Parameters<LanguageModel['doGenerate']>[0]
+type GenerateResult = Awaited<ReturnType<LanguageModel['doGenerate']>>
+
+// Provider health lives for the whole module, so every provider gets a fresh name
+let providerCount = 0
+
+function fakeProvider(label: string, respond: (options: GenerateOptions) => Promise<GenerateResult>, limiter = createLimiter(4)) {
+  const name = `${label}-${++providerCount}`
+  const doGenerate = vi.fn(respond)
+  const model = {
+    specificationVersion: 'v1',
+    provider: name,
+    modelId: `${name}-model`,
+    defaultObjectGenerationMode: undefined,
+    doGenerate,
+    doStream: vi.fn()
+  } as unknown as LanguageModel
+  return { name, model, limiter, doGenerate }
+}
+
+const answer = (text: string) => async (): Promise<GenerateResult> => ({
+  text,
+  finishReason: 'stop',
+  usage: { promptTokens: 1, completionTokens: 1 },
+  rawCall: { rawPrompt: null, rawSettings: {} }
+})
+
+// Answers after ms, or rejects like a fetch would once the request is aborted
+const delayed = (ms: number, text: string) => (options: GenerateOptions) => new Promise<GenerateResult>((resolve, reject) => {
+  const timer = setTimeout(() => resolve(answer(text)()), ms)
+  options.abortSignal?.addEventListener('abort', () => {
+    clearTimeout(timer)
+    reject(Object.assign(new Error('The operation was aborted'), { name: 'AbortError' }))
+  }, { once: true })
+})
+
+const failWith = (error: unknown) => async (): Promise<GenerateResult> => {
+  throw error
+}
+
+const apiError = (statusCode: number, responseHeaders?: Record<string, string>) => new APICallError({
+  message: `HTTP ${statusCode}`,
+  url: 'https://provider.test/v1/chat',
+  requestBodyValues: {},
+  statusCode,
+  responseHeaders
+})
+
+const generate = (model: LanguageModel) => model.doGenerate({
+  inputFormat: 'prompt',
+  mode: { type: 'regular' },
+  prompt: [{ role: 'user', content: [{ type: 'text', text: 'Plan the collection' }] }]
+})
+
+afterEach(() => {
+  vi.restoreAllMocks()
+})
+
+describe('createRoutedModel', () => {
+  it.each([429, 500, 503])('fails over to the next provider on %i', async (statusCode) => {
+    const first = fakeProvider('first', failWith(apiError(statusCode)))
+    const second = fakeProvider('second', answer('from second'))
+
+    const result = await generate(createRoutedModel([first, second]))
+
+    expect(result.text).toBe('from second')
+    expect(first.doGenerate).toHaveBeenCalledTimes(1)
+    expect(second.doGenerate).toHaveBeenCalledTimes(1)
+  })
+
+  it.each([400, 401, 404, 422])('does not fail over on %i', async (statusCode) => {
+    const first = fakeProvider('first', failWith(apiError(statusCode)))
+    const second = fakeProvider('second', answer('from second'))
+
+    await expect(generate(createRoutedModel([first, second]))).rejects.toThrow(`HTTP ${statusCode}`)
+    expect(second.doGenerate).not.toHaveBeenCalled()
+    expect(getRouterMetrics().providers[first.name].coolingDown).toBe(false)
+  })
+
+  it('reports the provider that served the request as response.modelId', async () => {
+    const first = fakeProvider('first', failWith(apiError(503)))
+    const second = fakeProvider('second', answer('from second'))
+    const routed = createRoutedModel([first, second])
+
+    const result = await generate(routed)
+
+    // The routed model keeps the first provider's id so cache keys stay stable
+    expect(routed.modelId).toBe(first.model.modelId)
+    expect(result.response?.modelId).toBe(second.model.modelId)
+  })
+})
+
+describe('rankProviders', () => {
+  it('ranks a cooling-down provider last for as long as its Retry-After', async () => {
+    const limited = fakeProvider('limited', failWith(apiError(429, { 'retry-after': '120' })))
+    const healthy = fakeProvider('healthy', answer('ok'))
+
+    await generate(createRoutedModel([limited, healthy]))
+
+    expect(rankProviders([limited, healthy]).map(provider => provider.name)).toEqual([healthy.name, limited.name])
+    expect(getRouterMetrics().providers[limited.name].coolingDown).toBe(true)
+
+    // Still cooling down after the 30s default, but not after 120s
+    const now = Date.now()
+    const clock = vi.spyOn(Date, 'now').mockReturnValue(now + 60_000)
+    expect(getRouterMetrics().providers[limited.name].coolingDown).toBe(true)
+    clock.mockReturnValue(now + 121_000)
+    expect(getRouterMetrics().providers[limited.name].coolingDown).toBe(false)
+  })
+
+  it('sends the next request past a cooling-down provider', async () => {
+    const limited = fakeProvider('limited', failWith(apiError(429)))
+    const healthy = fakeProvider('healthy', answer('ok'))
+    const routed = createRoutedModel([limited, healthy])
+
+    await generate(routed)
+    await generate(routed)
+
+    expect(limited.doGenerate).toHaveBeenCalledTimes(1)
+    expect(healthy.doGenerate).toHaveBeenCalledTimes(2)
+  })
+
+  it('ranks a provider that has only failed behind healthy ones once its cooldown ends', async () => {
+    const failing = fakeProvider('failing', failWith(new Error('socket hang up')))
+    const healthy = fakeProvider('healthy', answer('ok'))
+
+    await generate(createRoutedModel([failing, healthy]))
+
+    // Past the default cooldown, inside the health window
+    vi.spyOn(Date, 'now').mockReturnValue(Date.now() + 31_000)
+
+    const metrics = getRouterMetrics().providers
+    expect(metrics[failing.name].coolingDown).toBe(false)
+    expect(metrics[failing.name].score).toBeGreaterThan(metrics[healthy.name].score)
+    expect(rankProviders([failing, healthy]).map(provider => provider.name)).toEqual([healthy.name, failing.name])
+  })
+
+  it('tries unmeasured providers in configured order', () => {
+    const first = fakeProvider('first', answer('ok'))
+    const second = fakeProvider('second', answer('ok'))
+
+    expect(rankProviders([first, second]).map(provider => provider.name)).toEqual([first.name, second.name])
+  })
+})
+
+describe('hedged routing', () => {
+  // LLM_HEDGE_BUDGET is read when the router loads, and hedge counts are
+  // per module, so each test gets its own copy
+  async function loadRouter(hedgeBudget: string) {
+    vi.stubEnv('LLM_HEDGE_BUDGET', hedgeBudget)
+    vi.resetModules()
+    return await import('../llm-router')
+  }
+
+  // Gives a provider latency samples, and with them a p90 and a rank
+  async function warmUp(router: typeof import('../llm-router'), provider: ReturnType<typeof fakeProvider>, count: number, ms: number) {
+    provider.doGenerate.mockImplementation(delayed(ms, 'warm-up'))
+    for (let i = 0; i < count; i++) {
+      await generate(router.createRoutedModel([provider]))
+    }
+    provider.doGenerate.mockClear()
+  }
+
+  afterEach(() => {
+    vi.unstubAllEnvs()
+  })
+
+  it('races the runner-up once the primary passes its p90 and aborts the loser', async () => {
+    const router = await loadRouter('1')
+    const primary = fakeProvider('primary', answer('unused'))
+    const backup = fakeProvider('backup', answer('unused'))
+    await warmUp(router, primary, 20, 0)
+    await warmUp(router, backup, 2, 100)
+
+    primary.doGenerate.mockImplementation(delayed(500, 'from primary'))
+    backup.doGenerate.mockImplementation(delayed(10, 'from backup'))
+    const result = await generate(router.createRoutedModel([primary, backup], { hedge: true }))
+
+    expect(result.text).toBe('from backup')
+    expect(result.response?.modelId).toBe(backup.model.modelId)
+    expect(primary.doGenerate.mock.calls[0][0].abortSignal?.aborted).toBe(true)
+    expect(router.getRouterMetrics().hedging).toMatchObject({ requests: 1, hedges: 1, wins: 1 })
+    // The aborted primary is not counted against its health
+    expect(router.getRouterMetrics().providers[primary.name].errorRate).toBe(0)
+  })
+
+  it('does not count time queued behind the primary limiter towards the hedge delay', async () => {
+    const router = await loadRouter('1')
+    const primary = fakeProvider('primary', answer('unused'), createLimiter(1))
+    const backup = fakeProvider('backup', answer('unused'))
+    await warmUp(router, primary, 3, 40)
+    await warmUp(router, backup, 2, 100)
+
+    // Holds the primary's only slot for longer than its p90
+    const busy = primary.limiter(() => new Promise(resolve => setTimeout(resolve, 80)))
+    primary.doGenerate.mockImplementation(delayed(5, 'from primary'))
+    backup.doGenerate.mockImplementation(delayed(5, 'from backup'))
+    const result = await generate(router.createRoutedModel([primary, backup], { hedge: true }))
+    await busy
+
+    expect(result.text).toBe('from primary')
+    expect(backup.doGenerate).not.toHaveBeenCalled()
+  })
+
+  it('keeps hedges within the budget, starting with the first request', async () => {
+    const router = await loadRouter('0.5')
+    const primary = fakeProvider('primary', answer('unused'))
+    const backup = fakeProvider('backup', answer('unused'))
+    await warmUp(router, primary, 40, 0)
+    await warmUp(router, backup, 2, 100)
+
+    primary.doGenerate.mockImplementation(delayed(60, 'from primary'))
+    backup.doGenerate.mockImplementation(delayed(10, 'from backup'))
+    const routed = router.createRoutedModel([primary, backup], { hedge: true })
+    const served: string[] = []
+    for (let i = 0; i < 6; i++) {
+      served.push((await generate(routed)).text!)
+    }
+
+    expect(served).toEqual(['from primary', 'from backup', 'from primary', 'from backup', 'from primary', 'from backup'])
+    expect(router.getRouterMetrics().hedging).toMatchObject({ budget: 0.5, requests: 6, hedges: 3, wins: 3 })
+  })
+})
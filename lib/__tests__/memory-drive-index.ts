@@ -0,0 +1,74 @@
+import type {
+  DriveChange,
+  DriveChangesPage,
+  DriveChangesSource,
+  DriveFileMetadata,
+  DriveIndexStore
+} from '../drive-index'
+
+// In-memory stand-in for the Drive Changes API. Page tokens are positions in
+// the change log, so a token saved by syncDriveIndex replays exactly the
+// changes made after it, as Drive does.
+export class MemoryDriveChanges implements DriveChangesSource {
+  private files = new Map<string, DriveFileMetadata>()
+  private log: DriveChange[] = []
+
+  constructor(private pageSize = 100) {}
+
+  putFile(file: DriveFileMetadata) {
+    this.files.set(file.id, file)
+    this.log.push({ fileId: file.id, removed: false, file })
+  }
+
+  trashFile(fileId: string) {
+    const file = { ...this.files.get(fileId)!, trashed: true }
+    this.files.set(fileId, file)
+    this.log.push({ fileId, removed: false, file })
+  }
+
+  removeFile(fileId: string) {
+    this.files.delete(fileId)
+    this.log.push({ fileId, removed: true, file: null })
+  }
+
+  async getStartPageToken() {
+    return String(this.log.length)
+  }
+
+  async listChanges(pageToken: string): Promise<DriveChangesPage> {
+    const start = Number(pageToken)
+    const end = Math.min(start + this.pageSize, this.log.length)
+    const changes = this.log.slice(start, end)
+
+    return end < this.log.length
+      ? { changes, nextPageToken: String(end) }
+      : { changes, newStartPageToken: String(end) }
+  }
+
+  async *listAllFiles() {
+    for (const file of Array.from(this.files.values())) {
+      if (!file.trashed) yield file
+    }
+  }
+}
+
+export class MemoryDriveIndexStore implements DriveIndexStore {
+  files = new Map<string, DriveFileMetadata>()
+  pageTokens = new Map<string, string>()
+
+  async getPageToken(driveKey: string) {
+    return this.pageTokens.get(driveKey) ?? null
+  }
+
+  async savePageToken(driveKey: string, pageToken: string) {
+    this.pageTokens.set(driveKey, pageToken)
+  }
+
+  async upsertFiles(files: DriveFileMetadata[]) {
+    files.forEach(file => this.files.set(file.id, file))
+  }
+
+  async removeFiles(fileIds: string[]) {
+    fileIds.forEach(fileId => this.files.delete(fileId))
+  }
+}
@@ -0,0 +1,58 @@
+import { afterEach, describe, expect, it, vi } from 'vitest'
+import { createOllama, warmOllamaModel } from '../ollama'
+
+const chatResponse = () => new Response(JSON.stringify({
+  message: { content: 'ok' },
+  done: true,
+  done_reason: 'stop',
+  prompt_eval_count: 3,
+  eval_count: 1
+}))
+
+const sentKeepAlive = (fetchMock: ReturnType<typeof vi.fn>) =>
+  JSON.parse(fetchMock.mock.calls[0][1].body).keep_alive
+
+const generate = (keepAlive?: string | number) => createOllama({ baseURL: 'http://ollama.test', keepAlive })('llama3.1:8b').doGenerate({
+  inputFormat: 'prompt',
+  mode: { type: 'regular' },
+  prompt: [{ role: 'user', content: [{ type: 'text', text: 'hi' }] }]
+})
+
+afterEach(() => {
+  vi.restoreAllMocks()
+  vi.unstubAllEnvs()
+})
+
+describe('keep_alive', () => {
+  it.each([
+    ['-1', -1],
+    ['0', 0],
+    ['3600', 3600],
+    ['30m', '30m']
+  ])('sends OLLAMA_KEEP_ALIVE=%s as %j', async (value, expected) => {
+    vi.stubEnv('OLLAMA_KEEP_ALIVE', value)
+    const fetchMock = vi.spyOn(globalThis, 'fetch').mockImplementation(async () => chatResponse())
+
+    await generate()
+
+    expect(sentKeepAlive(fetchMock)).toBe(expected)
+  })
+
+  it('uses the same value when warming the model', async () => {
+    vi.stubEnv('OLLAMA_KEEP_ALIVE', '-1')
+    const fetchMock = vi.spyOn(globalThis, 'fetch').mockImplementation(async () => new Response('{}'))
+
+    await warmOllamaModel('llama3.1:8b', { baseURL: 'http://ollama.test' })
+
+    expect(sentKeepAlive(fetchMock)).toBe(-1)
+  })
+
+  it('prefers the configured value over the environment', async () => {
+    vi.stubEnv('OLLAMA_KEEP_ALIVE', '-1')
+    const fetchMock = vi.spyOn(globalThis, 'fetch').mockImplementation(async () => chatResponse())
+
+    await generate('5m')
+
+    expect(sentKeepAlive(fetchMock)).toBe('5m')
+  })
+})
@@ -0,0 +1,154 @@
+import { beforeEach, describe, expect, it, vi } from 'vitest'
+
+vi.mock('../supabase', () => ({ supabaseAdmin: {} }))
+vi.mock('../microsoft-graph', () => ({ graphClient: {} }))
+vi.mock('../google-drive', () => ({ drive: {}, iterateFiles: vi.fn() }))
+
+import { latestDeltaPerItem, syncOneDriveIndex, type DeltaPage, type OneDriveIndexStore } from '../onedrive-index'
+
+const DELTA_ENDPOINT = '/me/drive/root/delta?$select=id,name,parentReference,file,folder,lastModifiedDateTime,size,deleted'
+
+const item = (id: string, name = `${id}.xlsx`) => ({ id, name, file: { mimeType: 'application/octet-stream' } })
+const deleted = (id: string) => ({ id, deleted: { state: 'deleted' } })
+
+class MemoryOneDriveIndexStore implements OneDriveIndexStore {
+  items = new Map<string, Map<string, any>>()
+  deltaLinks = new Map<string, string>()
+
+  drive(driveKey: string) {
+    if (!this.items.has(driveKey)) this.items.set(driveKey, new Map())
+    return this.items.get(driveKey)!
+  }
+
+  async getDeltaLink(driveKey: string) {
+    return this.deltaLinks.get(driveKey) ?? null
+  }
+
+  async saveDeltaLink(driveKey: string, deltaLink: string) {
+    this.deltaLinks.set(driveKey, deltaLink)
+  }
+
+  async upsertItems(driveKey: string, items: any[]) {
+    items.forEach(entry => this.drive(driveKey).set(entry.id, entry))
+  }
+
+  async removeItems(driveKey: string, itemIds: string[]) {
+    itemIds.forEach(itemId => this.drive(driveKey).delete(itemId))
+  }
+
+  async reset(driveKey: string) {
+    this.items.delete(driveKey)
+    this.deltaLinks.delete(driveKey)
+  }
+}
+
+// Fake Graph delta endpoint: serves canned pages by URL and records requests
+function fakeFetch(pages: Record<string, DeltaPage | Error>) {
+  return vi.fn(async (url: string) => {
+    const page = pages[url]
+    if (!page) throw new Error(`Unexpected request: ${url}`)
+    if (page instanceof Error) throw page
+    return page
+  })
+}
+
+const gone = () => Object.assign(new Error('Gone'), { statusCode: 410 })
+
+describe('syncOneDriveIndex', () => {
+  let store: MemoryOneDriveIndexStore
+
+  beforeEach(() => {
+    store = new MemoryOneDriveIndexStore()
+  })
+
+  it('follows nextLink through every page and stores the deltaLink', async () => {
+    const fetchPage = fakeFetch({
+      [DELTA_ENDPOINT]: { value: [item('a'), item('b')], '@odata.nextLink': 'page-2' },
+      'page-2': { value: [item('c')], '@odata.nextLink': 'page-3' },
+      'page-3': { value: [], '@odata.deltaLink': 'delta-1' }
+    })
+
+    const result = await syncOneDriveIndex(fetchPage, 'default', store)
+
+    expect(result).toEqual({ upserted: 3, removed: 0, full: true })
+    expect(fetchPage.mock.calls.map(([url]) => url)).toEqual([DELTA_ENDPOINT, 'page-2', 'page-3'])
+    expect(Array.from(store.drive('default').keys())).toEqual(['a', 'b', 'c'])
+    expect(store.deltaLinks.get('default')).toBe('delta-1')
+  })
+
+  it('resumes from the saved deltaLink and applies deletions', async () => {
+    await store.upsertItems('default', [item('a'), item('b')])
+    await store.saveDeltaLink('default', 'delta-1')
+    const fetchPage = fakeFetch({
+      'delta-1': { value: [deleted('a'), item('c')], '@odata.deltaLink': 'delta-2' }
+    })
+
+    const result = await syncOneDriveIndex(fetchPage, 'default', store)
+
+    expect(result).toEqual({ upserted: 1, removed: 1, full: false })
+    expect(Array.from(store.drive('default').keys())).toEqual(['b', 'c'])
+    expect(store.deltaLinks.get('default')).toBe('delta-2')
+  })
+
+  it('applies only the last entry for an item listed twice in a page', async () => {
+    await store.saveDeltaLink('default', 'delta-1')
+    const fetchPage = fakeFetch({
+      'delta-1': { value: [item('a'), deleted('a'), deleted('b'), item('b', 'restored.xlsx')], '@odata.deltaLink': 'delta-2' }
+    })
+
+    await syncOneDriveIndex(fetchPage, 'default', store)
+
+    expect(store.drive('default').has('a')).toBe(false)
+    expect(store.drive('default').get('b')?.name).toBe('restored.xlsx')
+  })
+
+  it('resets only its own drive and resyncs when the deltaLink has expired', async () => {
+    await store.upsertItems('default', [item('stale')])
+    await store.saveDeltaLink('default', 'expired')
+    await store.upsertItems('other', [item('kept')])
+    await store.saveDeltaLink('other', 'other-delta')
+    const fetchPage = fakeFetch({
+      expired: gone(),
+      [DELTA_ENDPOINT]: { value: [item('a')], '@odata.deltaLink': 'delta-2' }
+    })
+
+    const result = await syncOneDriveIndex(fetchPage, 'default', store)
+
+    expect(result).toEqual({ upserted: 1, removed: 0, full: true })
+    expect(Array.from(store.drive('default').keys())).toEqual(['a'])
+    expect(store.deltaLinks.get('default')).toBe('delta-2')
+    expect(Array.from(store.drive('other').keys())).toEqual(['kept'])
+    expect(store.deltaLinks.get('other')).toBe('other-delta')
+  })
+
+  it('rethrows a 410 on the initial enumeration instead of looping', async () => {
+    const fetchPage = fakeFetch({ [DELTA_ENDPOINT]: gone() })
+
+    await expect(syncOneDriveIndex(fetchPage, 'default', store)).rejects.toThrow('Gone')
+    expect(fetchPage).toHaveBeenCalledTimes(1)
+  })
+})
+
+describe('latestDeltaPerItem', () => {
+  it('keeps only the last occurrence of each item', () => {
+    const items = latestDeltaPerItem([
+      { id: 'a', name: 'a.xlsx' },
+      { id: 'b', name: 'b.xlsx' },
+      { id: 'a', deleted: { state: 'deleted' } }
+    ])
+
+    expect(items).toEqual([
+      { id: 'b', name: 'b.xlsx' },
+      { id: 'a', deleted: { state: 'deleted' } }
+    ])
+  })
+
+  it('lets a restore after a delete win', () => {
+    const items = latestDeltaPerItem([
+      { id: 'a', deleted: { state: 'deleted' } },
+      { id: 'a', name: 'a.xlsx' }
+    ])
+
+    expect(items).toEqual([{ id: 'a', name: 'a.xlsx' }])
+  })
+})
@@ -0,0 +1,33 @@
+import { describe, expect, it } from 'vitest'
+import { decodeCursor, encodeCursor } from '../pagination'
+
+const row = {
+  created_at: '2025-09-17T10:00:00.123456+00:00',
+  id: '6f1c2a8e-3b4d-4e5f-8a9b-0c1d2e3f4a5b'
+}
+
+const rawCursor = (value: unknown) => Buffer.from(JSON.stringify(value)).toString('base64url')
+
+describe('decodeCursor', () => {
+  it('round-trips an encoded row', () => {
+    expect(decodeCursor(encodeCursor(row))).toEqual({ createdAt: row.created_at, id: row.id })
+  })
+
+  it('returns null without a cursor', () => {
+    expect(decodeCursor(null)).toBeNull()
+  })
+
+  it('rejects malformed input', () => {
+    expect(decodeCursor('not base64 json')).toBeNull()
+    expect(decodeCursor(rawCursor({ createdAt: row.created_at, id: row.id }))).toBeNull()
+  })
+
+  it('rejects an id that is not a uuid', () => {
+    expect(decodeCursor(rawCursor([row.created_at, '1),id.gt.(0']))).toBeNull()
+  })
+
+  it('rejects a created_at that is not a timestamp', () => {
+    expect(decodeCursor(rawCursor(['2025-09-17",id.gt."0', row.id]))).toBeNull()
+    expect(decodeCursor(rawCursor(['2025-13-45T99:00:00Z', row.id]))).toBeNull()
+  })
+})
@@ -0,0 +1,68 @@
+import { supabaseAdmin } from './supabase'
+import { getEmbeddingService } from './embeddings'
+
+export type MemoryType = 'procedural' | 'episodic' | 'semantic' | 'contextual'
+
+export interface MemorySearchOptions {
+  checkType?: string
+  memoryType?: MemoryType
+  minConfidence?: number
+  threshold?: number
+  limit?: number
+  embeddingModel?: string
+}
+
+// Nearest memories to an embedding, filtered inside the index scan
+export async function searchMemories(embedding: number[], options: MemorySearchOptions = {}) {
+  const { data, error } = await supabaseAdmin.rpc('search_memories_filtered', {
+    query_embedding: JSON.stringify(embedding),
+    p_check_type: options.checkType ?? null,
+    p_memory_type: options.memoryType ?? null,
+    p_min_confidence: options.minConfidence ?? null,
+    match_threshold: options.threshold ?? 0.8,
+    match_count: options.limit ?? 5,
+    p_embedding_model: options.embeddingModel ?? null
+  })
+
+  if (error) throw error
+  return data || []
+}
+
+export async function searchMemoriesByText(text: string, options: MemorySearchOptions = {}) {
+  const service = getEmbeddingService()
+  const embedding = await service.embed(text)
+  return await searchMemories(embedding, { embeddingModel: service.embedder.id, ...options })
+}
+
+// Text a memory is embedded from
+export function memoryText(memory: { check_name?: string | null, content: unknown }) {
+  return [memory.check_name, JSON.stringify(memory.content)].filter(Boolean).join('\n')
+}
+
+// Re-embeds memories missing an embedding or embedded by a different model,
+// one batch per call; run until it returns 0 after switching EMBEDDING_PROVIDER
+export async function reembedMemories(batchSize = 200) {
+  const service = getEmbeddingService()
+  const modelId = service.embedder.id
+
+  const { data: memories, error } = await supabaseAdmin
+    .from('agent_memories')
+    .select('id, check_name, content')
+    .or(`embedding_model.is.null,embedding_model.neq."${modelId}"`)
+    .limit(batchSize)
+
+  if (error) throw error
+  if (!memories || memories.length === 0) return 0
+
+  const embeddings = await service.embedMany(memories.map(memoryText))
+  const { error: updateError } = await supabaseAdmin.rpc('set_memory_embeddings', {
+    updates: memories.map((memory, index) => ({
+      id: memory.id,
+      embedding: JSON.stringify(embeddings[index]),
+      embedding_model: modelId
+    }))
+  })
+
+  if (updateError) throw updateError
+  return memories.length
+}
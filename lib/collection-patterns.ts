@@ -0,0 +1,50 @@
+import { supabaseAdmin } from './supabase'
+
+interface PatternCheck {
+  id: string
+  check_type: string
+  check_name: string
+}
+
+export interface FileSearchPattern {
+  // e.g. AD_User_Report_*FINAL*.xlsx
+  glob: string
+  source: 'google_drive' | 'onedrive'
+}
+
+// File glob from a learned pattern's search_files step, and the store its
+// connect step points at (Google Drive unless it connects to OneDrive)
+function searchFilesPattern(stepSequence: any): FileSearchPattern | null {
+  const steps = Array.isArray(stepSequence) ? stepSequence : []
+  const step = steps.find(entry => entry?.action === 'search_files')
+  if (typeof step?.params?.pattern !== 'string') return null
+
+  const onedrive = steps.some(entry => entry?.action === 'connect_onedrive')
+  return { glob: step.params.pattern, source: onedrive ? 'onedrive' : 'google_drive' }
+}
+
+// Maps check id to the file its learned collection pattern searches for.
+// A pattern for the exact check wins over one for the whole check type.
+export async function getFileSearchPatterns(checks: PatternCheck[]) {
+  const globs = new Map<string, FileSearchPattern>()
+  const checkTypes = Array.from(new Set(checks.map(check => check.check_type)))
+  if (checkTypes.length === 0) return globs
+
+  const { data, error } = await supabaseAdmin
+    .from('collection_patterns')
+    .select('check_type, check_name, step_sequence')
+    .in('check_type', checkTypes)
+    .order('usage_count', { ascending: false })
+
+  if (error) throw error
+
+  for (const check of checks) {
+    const candidates = (data || []).filter((pattern: any) => pattern.check_type === check.check_type)
+    const pattern = candidates.find((candidate: any) => candidate.check_name === check.check_name)
+      || candidates.find((candidate: any) => !candidate.check_name)
+    const search = pattern && searchFilesPattern(pattern.step_sequence)
+    if (search) globs.set(check.id, search)
+  }
+
+  return globs
+}
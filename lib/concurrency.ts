@@ -0,0 +1,67 @@
+// Bounded concurrency helpers for fan-out work (evidence collection, LLM calls)
+
+export type Limiter = <T>(task: () => Promise<T>) => Promise<T>
+
+export function createLimiter(maxConcurrency: number): Limiter {
+  const limit = Math.max(1, Math.floor(maxConcurrency) || 1)
+  const waiting: (() => void)[] = []
+  let active = 0
+
+  // A finished task hands its slot straight to the next waiter, so a caller
+  // arriving before that waiter resumes can't see a free slot and overrun the limit
+  const release = () => {
+    const next = waiting.shift()
+    if (next) {
+      next()
+    } else {
+      active--
+    }
+  }
+
+  return async <T>(task: () => Promise<T>): Promise<T> => {
+    if (active >= limit) {
+      await new Promise<void>(resolve => waiting.push(resolve))
+    } else {
+      active++
+    }
+    try {
+      return await task()
+    } finally {
+      release()
+    }
+  }
+}
+
+// Runs worker over items with at most `concurrency` in flight. Results keep
+// the input order regardless of completion order.
+export async function runPool<T, R>(
+  items: T[],
+  concurrency: number,
+  worker: (item: T, index: number) => Promise<R>
+): Promise<R[]> {
+  const results: R[] = new Array(items.length)
+  let cursor = 0
+  let failed = false
+
+  const runWorker = async () => {
+    while (!failed && cursor < items.length) {
+      const index = cursor++
+      try {
+        results[index] = await worker(items[index], index)
+      } catch (error) {
+        // Stop handing out new items; in-flight ones finish on their own
+        failed = true
+        throw error
+      }
+    }
+  }
+
+  const workerCount = Math.min(Math.max(1, Math.floor(concurrency) || 1), items.length)
+  await Promise.all(Array.from({ length: workerCount }, runWorker))
+  return results
+}
+
+export function readConcurrency(name: string, fallback: number) {
+  const value = parseInt(process.env[name] || '', 10)
+  return Number.isFinite(value) && value > 0 ? value : fallback
+}
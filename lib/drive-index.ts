@@ -0,0 +1,211 @@
+import { supabaseAdmin } from './supabase'
+import { drive, iterateFiles } from './google-drive'
+
+const INDEX_FIELDS = 'id,name,mimeType,modifiedTime,parents,md5Checksum,size'
+const WRITE_BATCH_SIZE = 500
+
+export interface DriveFileMetadata {
+  id: string
+  name: string
+  mimeType?: string | null
+  modifiedTime?: string | null
+  parents?: string[] | null
+  md5Checksum?: string | null
+  size?: string | null
+  trashed?: boolean | null
+}
+
+export interface DriveChange {
+  fileId: string
+  removed?: boolean | null
+  file?: DriveFileMetadata | null
+}
+
+export interface DriveChangesPage {
+  changes: DriveChange[]
+  nextPageToken?: string | null
+  newStartPageToken?: string | null
+}
+
+// The parts of the Drive API the index needs. Swap in a local implementation
+// to exercise syncDriveIndex without Google.
+export interface DriveChangesSource {
+  getStartPageToken(): Promise<string>
+  listChanges(pageToken: string): Promise<DriveChangesPage>
+  listAllFiles(): AsyncIterable<DriveFileMetadata>
+}
+
+export const googleDriveChanges: DriveChangesSource = {
+  async getStartPageToken() {
+    const response = await drive.changes.getStartPageToken({})
+    return response.data.startPageToken!
+  },
+
+  async listChanges(pageToken: string) {
+    const response = await drive.changes.list({
+      pageToken,
+      pageSize: 1000,
+      includeRemoved: true,
+      fields: `nextPageToken,newStartPageToken,changes(fileId,removed,file(${INDEX_FIELDS},trashed))`
+    })
+    return response.data as DriveChangesPage
+  },
+
+  listAllFiles() {
+    return iterateFiles({ query: 'trashed = false', fields: INDEX_FIELDS }) as AsyncIterable<DriveFileMetadata>
+  }
+}
+
+const toIndexRow = (file: DriveFileMetadata) => ({
+  id: file.id,
+  name: file.name,
+  mime_type: file.mimeType,
+  modified_time: file.modifiedTime,
+  parents: file.parents || [],
+  md5: file.md5Checksum,
+  size: file.size ? Number(file.size) : null,
+  indexed_at: new Date().toISOString()
+})
+
+// Where the index and its change-feed position are kept. Swap in a local
+// implementation together with a DriveChangesSource to run syncDriveIndex
+// without Supabase or Google.
+export interface DriveIndexStore {
+  getPageToken(driveKey: string): Promise<string | null>
+  savePageToken(driveKey: string, pageToken: string): Promise<void>
+  upsertFiles(files: DriveFileMetadata[]): Promise<void>
+  removeFiles(fileIds: string[]): Promise<void>
+}
+
+export const supabaseDriveIndex: DriveIndexStore = {
+  async getPageToken(driveKey) {
+    const { data, error } = await supabaseAdmin
+      .from('drive_sync_state')
+      .select('page_token')
+      .eq('drive_key', driveKey)
+      .maybeSingle()
+
+    if (error) throw error
+    return data?.page_token ?? null
+  },
+
+  async savePageToken(driveKey, pageToken) {
+    const { error } = await supabaseAdmin
+      .from('drive_sync_state')
+      .upsert({ drive_key: driveKey, page_token: pageToken }, { onConflict: 'drive_key' })
+    if (error) throw error
+  },
+
+  async upsertFiles(files) {
+    if (files.length === 0) return
+    const { error } = await supabaseAdmin
+      .from('drive_file_index')
+      .upsert(files.map(toIndexRow), { onConflict: 'id' })
+    if (error) throw error
+  },
+
+  async removeFiles(fileIds) {
+    if (fileIds.length === 0) return
+    const { error } = await supabaseAdmin
+      .from('drive_file_index')
+      .delete()
+      .in('id', fileIds)
+    if (error) throw error
+  }
+}
+
+// A page can hold several changes for one file (e.g. removed, then restored).
+// Applying upserts and deletes as two groups would reorder them, so only the
+// last change per file is kept.
+export function latestChangePerFile(changes: DriveChange[]) {
+  const latest = new Map<string, DriveChange>()
+  for (const change of changes) {
+    latest.delete(change.fileId)
+    latest.set(change.fileId, change)
+  }
+  return Array.from(latest.values())
+}
+
+// Brings drive_file_index up to date. The first run seeds the index with a
+// full listing; every later run applies only the changes since the saved token.
+export async function syncDriveIndex(
+  source: DriveChangesSource = googleDriveChanges,
+  driveKey = 'default',
+  store: DriveIndexStore = supabaseDriveIndex
+) {
+  const savedToken = await store.getPageToken(driveKey)
+
+  if (!savedToken) {
+    // Take the token before listing so changes made during the seed are replayed
+    const startPageToken = await source.getStartPageToken()
+    let batch: DriveFileMetadata[] = []
+    let indexed = 0
+
+    for await (const file of source.listAllFiles()) {
+      batch.push(file)
+      if (batch.length >= WRITE_BATCH_SIZE) {
+        await store.upsertFiles(batch)
+        indexed += batch.length
+        batch = []
+      }
+    }
+    await store.upsertFiles(batch)
+    indexed += batch.length
+
+    await store.savePageToken(driveKey, startPageToken)
+    return { seeded: true, upserted: indexed, removed: 0 }
+  }
+
+  let pageToken = savedToken
+  let upserted = 0
+  let removed = 0
+
+  while (true) {
+    const page = await source.listChanges(pageToken)
+    const changes = latestChangePerFile(page.changes)
+    const live = changes.filter(change => !change.removed && change.file && !change.file.trashed)
+    const gone = changes.filter(change => change.removed || !change.file || change.file.trashed)
+
+    // Disjoint file ids, so the order of these two writes doesn't matter
+    await store.upsertFiles(live.map(change => change.file!))
+    await store.removeFiles(gone.map(change => change.fileId))
+    upserted += live.length
+    removed += gone.length
+
+    if (page.nextPageToken) {
+      pageToken = page.nextPageToken
+      continue
+    }
+
+    await store.savePageToken(driveKey, page.newStartPageToken || pageToken)
+    return { seeded: false, upserted, removed }
+  }
+}
+
+// Converts a file glob (AD_User_Report_*FINAL*.xlsx) to an ILIKE pattern
+export function globToLikePattern(glob: string) {
+  return glob
+    .replace(/[\\%_]/g, char => `\\${char}`)
+    .replace(/\*/g, '%')
+    .replace(/\?/g, '_')
+}
+
+export async function searchDriveIndex(
+  pattern: string,
+  options: { parentId?: string, limit?: number } = {}
+) {
+  let query = supabaseAdmin
+    .from('drive_file_index')
+    .select('id, name, mime_type, modified_time, parents, md5, size')
+    .ilike('name', globToLikePattern(pattern))
+    .order('modified_time', { ascending: false })
+    .limit(options.limit ?? 100)
+
+  if (options.parentId) {
+    query = query.contains('parents', [options.parentId])
+  }
+
+  const { data, error } = await query
+  if (error) throw error
+  return data || []
+}
@@ -0,0 +1,230 @@
+import crypto from 'crypto'
+import { embedMany } from 'ai'
+import { getEmbeddingModel } from './llm-providers'
+
+// Width of agent_memories.embedding
+export const EMBEDDING_COLUMN_DIMENSIONS = 1536
+
+export interface Embedder {
+  // Identifies the model; part of the cache key so vectors never mix
+  id: string
+  dimensions: number
+  maxBatchSize: number
+  embed(texts: string[]): Promise<number[][]>
+}
+
+export function createProviderEmbedder(model = getEmbeddingModel()): Embedder {
+  return {
+    id: `${model.provider}:${model.modelId}`,
+    dimensions: EMBEDDING_COLUMN_DIMENSIONS,
+    maxBatchSize: model.maxEmbeddingsPerCall ?? 2048,
+    async embed(texts) {
+      const { embeddings } = await embedMany({ model, values: texts })
+      return embeddings
+    }
+  }
+}
+
+// Local CPU embeddings through Ollama's /api/embed (nomic-embed-text: 768 dims)
+export function createOllamaEmbedder(
+  model = process.env.OLLAMA_EMBEDDING_MODEL || 'nomic-embed-text',
+  baseURL = process.env.OLLAMA_BASE_URL || 'http://localhost:11434'
+): Embedder {
+  return {
+    id: `ollama:${model}`,
+    dimensions: Number(process.env.OLLAMA_EMBEDDING_DIMENSIONS) || 768,
+    maxBatchSize: 64,
+    async embed(texts) {
+      const response = await fetch(`${baseURL}/api/embed`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ model, input: texts })
+      })
+      if (!response.ok) {
+        throw new Error(`Ollama embed failed: ${response.status} ${await response.text()}`)
+      }
+      const data = await response.json()
+      return data.embeddings
+    }
+  }
+}
+
+// Fits an embedder to a fixed-width vector column. Shorter vectors are
+// zero-padded, which leaves cosine distances unchanged; wider models are
+// rejected rather than truncated, since that only works for some models.
+export function fitToColumn(embedder: Embedder, columnDimensions = EMBEDDING_COLUMN_DIMENSIONS): Embedder {
+  if (embedder.dimensions > columnDimensions) {
+    throw new Error(`Embedding model ${embedder.id} produces ${embedder.dimensions} dimensions; the column holds ${columnDimensions}`)
+  }
+  if (embedder.dimensions === columnDimensions) return embedder
+
+  return {
+    ...embedder,
+    dimensions: columnDimensions,
+    async embed(texts) {
+      const vectors = await embedder.embed(texts)
+      return vectors.map(vector => {
+        if (vector.length > columnDimensions) {
+          throw new Error(`Embedding model ${embedder.id} returned ${vector.length} dimensions; the column holds ${columnDimensions}`)
+        }
+        return vector.concat(new Array(columnDimensions - vector.length).fill(0))
+      })
+    }
+  }
+}
+
+// Deterministic offline embedder: hashes word unigrams and bigrams into a
+// fixed-size vector (feature hashing) and L2-normalizes it. Texts sharing
+// words land close together, which is enough for tests and local runs.
+export function createHashEmbedder(dimensions = EMBEDDING_COLUMN_DIMENSIONS): Embedder {
+  const embedOne = (text: string) => {
+    const vector = new Array<number>(dimensions).fill(0)
+    const words = text.toLowerCase().match(/[a-z0-9]+/g) || []
+    const features = [...words, ...words.slice(1).map((word, i) => `${words[i]} ${word}`)]
+
+    for (const feature of features) {
+      const digest = crypto.createHash('sha256').update(feature).digest()
+      const index = digest.readUInt32BE(0) % dimensions
+      vector[index] += digest[4] & 1 ? 1 : -1
+    }
+
+    const norm = Math.sqrt(vector.reduce((sum, value) => sum + value * value, 0)) || 1
+    return vector.map(value => value / norm)
+  }
+
+  return {
+    id: `hash:${dimensions}`,
+    dimensions,
+    maxBatchSize: Infinity,
+    async embed(texts) {
+      return texts.map(embedOne)
+    }
+  }
+}
+
+class LruCache<V> {
+  private entries = new Map<string, V>()
+
+  constructor(private capacity: number) {}
+
+  get(key: string) {
+    const value = this.entries.get(key)
+    if (value !== undefined) {
+      // Re-insert to mark as most recently used
+      this.entries.delete(key)
+      this.entries.set(key, value)
+    }
+    return value
+  }
+
+  set(key: string, value: V) {
+    this.entries.delete(key)
+    this.entries.set(key, value)
+    if (this.entries.size > this.capacity) {
+      this.entries.delete(this.entries.keys().next().value!)
+    }
+  }
+}
+
+export interface EmbeddingServiceOptions {
+  cacheSize?: number
+  // How long concurrent embed() calls wait to share a batch
+  batchWindowMs?: number
+}
+
+// Embeds text through a content-hash LRU cache. Identical texts are embedded
+// once, and calls arriving within the batch window share provider requests
+// of up to embedder.maxBatchSize inputs.
+export function createEmbeddingService(embedder: Embedder, options: EmbeddingServiceOptions = {}) {
+  const { cacheSize = 10000, batchWindowMs = 10 } = options
+  const cache = new LruCache<number[]>(cacheSize)
+  const inFlight = new Map<string, Promise<number[]>>()
+  const stats = { hits: 0, misses: 0, requests: 0 }
+
+  let queue: { key: string, text: string, resolve: (vector: number[]) => void, reject: (error: unknown) => void }[] = []
+  let timer: ReturnType<typeof setTimeout> | null = null
+
+  const cacheKey = (text: string) =>
+    crypto.createHash('sha256').update(embedder.id).update('\0').update(text).digest('hex')
+
+  const flush = async () => {
+    timer = null
+    const batch = queue
+    queue = []
+
+    for (let i = 0; i < batch.length; i += embedder.maxBatchSize) {
+      const chunk = batch.slice(i, i + embedder.maxBatchSize)
+      stats.requests++
+      try {
+        const vectors = await embedder.embed(chunk.map(item => item.text))
+        chunk.forEach((item, index) => {
+          cache.set(item.key, vectors[index])
+          item.resolve(vectors[index])
+        })
+      } catch (error) {
+        chunk.forEach(item => item.reject(error))
+      } finally {
+        chunk.forEach(item => inFlight.delete(item.key))
+      }
+    }
+  }
+
+  const embed = (text: string): Promise<number[]> => {
+    const key = cacheKey(text)
+    const cached = cache.get(key)
+    if (cached) {
+      stats.hits++
+      return Promise.resolve(cached)
+    }
+
+    const pending = inFlight.get(key)
+    if (pending) {
+      stats.hits++
+      return pending
+    }
+
+    stats.misses++
+    const promise = new Promise<number[]>((resolve, reject) => {
+      queue.push({ key, text, resolve, reject })
+    })
+    inFlight.set(key, promise)
+
+    if (queue.length >= embedder.maxBatchSize) {
+      if (timer) clearTimeout(timer)
+      flush()
+    } else if (!timer) {
+      timer = setTimeout(flush, batchWindowMs)
+    }
+
+    return promise
+  }
+
+  return {
+    embedder,
+    embed,
+    embedMany: (texts: string[]) => Promise.all(texts.map(embed)),
+    getStats: () => ({ ...stats })
+  }
+}
+
+export type EmbeddingService = ReturnType<typeof createEmbeddingService>
+
+let defaultService: EmbeddingService | null = null
+
+export function getEmbedder(provider = process.env.EMBEDDING_PROVIDER || 'openai'): Embedder {
+  switch (provider) {
+    case 'ollama':
+      return fitToColumn(createOllamaEmbedder())
+    case 'hash':
+      return createHashEmbedder()
+    default:
+      return createProviderEmbedder()
+  }
+}
+
+export function getEmbeddingService() {
+  if (!defaultService) {
+    defaultService = createEmbeddingService(getEmbedder())
+  }
+  return defaultService
+}
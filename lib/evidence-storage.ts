@@ -0,0 +1,191 @@
+import crypto from 'crypto'
+import { Readable, Transform } from 'stream'
+import { supabaseAdmin } from './supabase'
+import { downloadFileStream, getFileMetadata } from './google-drive'
+import { downloadOneDriveFileStream, graphClient } from './microsoft-graph'
+
+const EVIDENCE_BUCKET = process.env.EVIDENCE_STORAGE_BUCKET || 'evidence'
+
+// Supabase's resumable (TUS) endpoint requires 6 MB chunks. Files larger than
+// one chunk go through it; the single-request upload is capped at 50 MB by
+// default and cannot resume.
+const RESUMABLE_CHUNK_SIZE = 6 * 1024 * 1024
+const RESUMABLE_MAX_RETRIES = 3
+
+export interface StoredEvidence {
+  storagePath: string
+  size: number
+  sha256: string
+}
+
+function toNodeStream(source: Readable | ReadableStream<Uint8Array>) {
+  return source instanceof Readable ? source : Readable.fromWeb(source as any)
+}
+
+// Pipes a download straight into Supabase Storage, hashing and counting bytes
+// on the way through. Only one chunk is held in memory at a time. Pass the
+// size when known so large files are uploaded resumably.
+export async function streamToStorage(
+  source: Readable | ReadableStream<Uint8Array>,
+  storagePath: string,
+  contentType = 'application/octet-stream',
+  size?: number
+): Promise<StoredEvidence> {
+  if (size !== undefined && size > RESUMABLE_CHUNK_SIZE) {
+    return await resumableUpload(toNodeStream(source), storagePath, contentType, size)
+  }
+
+  const input = toNodeStream(source)
+  const hash = crypto.createHash('sha256')
+  let bytes = 0
+
+  const meter = new Transform({
+    transform(chunk: Buffer, _encoding, callback) {
+      hash.update(chunk)
+      bytes += chunk.length
+      callback(null, chunk)
+    }
+  })
+
+  input.on('error', error => meter.destroy(error))
+  input.pipe(meter)
+
+  const { error } = await supabaseAdmin.storage
+    .from(EVIDENCE_BUCKET)
+    .upload(storagePath, meter as any, {
+      contentType,
+      upsert: true,
+      duplex: 'half'
+    })
+
+  if (error) {
+    input.destroy()
+    throw error
+  }
+
+  return { storagePath, size: bytes, sha256: hash.digest('hex') }
+}
+
+const tusHeaders = () => ({
+  Authorization: `Bearer ${process.env.SUPABASE_SERVICE_KEY}`,
+  'Tus-Resumable': '1.0.0'
+})
+
+const encodeMetadata = (metadata: Record<string, string>) =>
+  Object.entries(metadata)
+    .map(([key, value]) => `${key} ${Buffer.from(value).toString('base64')}`)
+    .join(',')
+
+// Sends one chunk, resuming from the server's offset after a failed attempt
+async function sendChunk(uploadUrl: string, chunk: Buffer, offset: number) {
+  for (let attempt = 0; ; attempt++) {
+    try {
+      const response = await fetch(uploadUrl, {
+        method: 'PATCH',
+        headers: {
+          ...tusHeaders(),
+          'Upload-Offset': String(offset),
+          'Content-Type': 'application/offset+octet-stream'
+        },
+        body: chunk
+      })
+      if (response.ok) return
+      if (response.status < 500 && response.status !== 409) {
+        throw new Error(`Resumable upload failed: ${response.status} ${await response.text()}`)
+      }
+    } catch (error) {
+      if (attempt >= RESUMABLE_MAX_RETRIES) throw error
+    }
+
+    if (attempt >= RESUMABLE_MAX_RETRIES) {
+      throw new Error(`Resumable upload failed after ${attempt + 1} attempts at offset ${offset}`)
+    }
+    await new Promise(resolve => setTimeout(resolve, 1000 * 2 ** attempt))
+
+    // The server may have stored the chunk before the connection dropped
+    const head = await fetch(uploadUrl, { method: 'HEAD', headers: tusHeaders() })
+    if (Number(head.headers.get('upload-offset')) === offset + chunk.length) return
+  }
+}
+
+async function resumableUpload(
+  input: Readable,
+  storagePath: string,
+  contentType: string,
+  size: number
+): Promise<StoredEvidence> {
+  const created = await fetch(`${process.env.SUPABASE_URL}/storage/v1/upload/resumable`, {
+    method: 'POST',
+    headers: {
+      ...tusHeaders(),
+      'Upload-Length': String(size),
+      'Upload-Metadata': encodeMetadata({
+        bucketName: EVIDENCE_BUCKET,
+        objectName: storagePath,
+        contentType
+      }),
+      'x-upsert': 'true'
+    }
+  })
+
+  const uploadUrl = created.headers.get('location')
+  if (!created.ok || !uploadUrl) {
+    input.destroy()
+    throw new Error(`Failed to start resumable upload: ${created.status} ${await created.text()}`)
+  }
+
+  const hash = crypto.createHash('sha256')
+  let offset = 0
+  let pending: Buffer[] = []
+  let pendingBytes = 0
+
+  try {
+    for await (const data of input) {
+      const chunk = Buffer.isBuffer(data) ? data : Buffer.from(data)
+      hash.update(chunk)
+      pending.push(chunk)
+      pendingBytes += chunk.length
+
+      while (pendingBytes >= RESUMABLE_CHUNK_SIZE) {
+        const buffered = Buffer.concat(pending)
+        const next = buffered.subarray(0, RESUMABLE_CHUNK_SIZE)
+        await sendChunk(uploadUrl, next, offset)
+        offset += next.length
+        pending = [buffered.subarray(RESUMABLE_CHUNK_SIZE)]
+        pendingBytes = pending[0].length
+      }
+    }
+
+    if (pendingBytes > 0) {
+      const last = Buffer.concat(pending)
+      await sendChunk(uploadUrl, last, offset)
+      offset += last.length
+    }
+  } catch (error) {
+    input.destroy()
+    throw error
+  }
+
+  if (offset !== size) {
+    throw new Error(`Resumable upload of ${storagePath} sent ${offset} bytes, expected ${size}`)
+  }
+
+  return { storagePath, size: offset, sha256: hash.digest('hex') }
+}
+
+export async function storeDriveFile(fileId: string, storagePath: string) {
+  const metadata = await getFileMetadata(fileId)
+  const source = await downloadFileStream(fileId)
+  return await streamToStorage(
+    source as Readable,
+    storagePath,
+    metadata.mimeType || undefined,
+    metadata.size ? Number(metadata.size) : undefined
+  )
+}
+
+export async function storeOneDriveFile(itemId: string, storagePath: string) {
+  const item = await graphClient.api(`/me/drive/items/${itemId}`).select('size,file').get()
+  const source = await downloadOneDriveFileStream(itemId)
+  return await streamToStorage(source, storagePath, item.file?.mimeType || undefined, item.size)
+}
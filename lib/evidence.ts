@@ -0,0 +1,59 @@
+import { supabaseAdmin } from './supabase'
+import { WriteBehindBuffer } from './write-buffer'
+import { readConcurrency } from './concurrency'
+import { isUuid } from './validation'
+
+const EVIDENCE_WRITE_BATCH_SIZE = readConcurrency('EVIDENCE_WRITE_BATCH_SIZE', 50)
+const EVIDENCE_WRITE_FLUSH_MS = readConcurrency('EVIDENCE_WRITE_FLUSH_MS', 1000)
+
+export interface EvidenceStatusUpdate {
+  id: string
+  status: 'pending' | 'collected' | 'approved' | 'rejected' | 'error'
+  approver_id?: string | null
+  approver_slack_user_id?: string | null
+  approval_notes?: string | null
+  approved_at?: string | null
+  rejected_at?: string | null
+}
+
+// Per-session buffer of evidence_items rows. Flushes are multi-row upserts on
+// (session_id, check_id), so re-flushing after a failure is idempotent.
+// Rows already approved or rejected are never overwritten.
+export function createEvidenceBuffer() {
+  return new WriteBehindBuffer<Record<string, any>>({
+    maxBatchSize: EVIDENCE_WRITE_BATCH_SIZE,
+    flushIntervalMs: EVIDENCE_WRITE_FLUSH_MS,
+    key: row => `${row.session_id}:${row.check_id}`,
+    write: async (rows) => {
+      const { error } = await supabaseAdmin
+        .rpc('upsert_collected_evidence', { items: rows })
+
+      if (error) throw error
+    }
+  })
+}
+
+const EVIDENCE_STATUSES = ['pending', 'collected', 'approved', 'rejected', 'error']
+
+// The status buffer is shared across requests, so a row the RPC would reject
+// must be turned away here rather than fail everyone else's batch
+export function isValidEvidenceStatusUpdate(update: EvidenceStatusUpdate) {
+  return isUuid(update.id)
+    && EVIDENCE_STATUSES.includes(update.status)
+    && (update.approver_id == null || isUuid(update.approver_id))
+}
+
+// Shared across requests in this instance: status changes that land within
+// the flush window (e.g. a burst of Slack approvals) go out as one statement.
+// Only enqueue rows that pass isValidEvidenceStatusUpdate.
+export const evidenceStatusBuffer = new WriteBehindBuffer<EvidenceStatusUpdate>({
+  maxBatchSize: 100,
+  flushIntervalMs: 200,
+  key: update => update.id,
+  write: async (updates) => {
+    const { error } = await supabaseAdmin
+      .rpc('bulk_update_evidence_status', { updates })
+
+    if (error) throw error
+  }
+})
@@ -1,4 +1,5 @@
-import { google } from 'googleapis'
+import { google, drive_v3 } from 'googleapis'
+import { createLimiter } from './concurrency'
 
 const credentials = JSON.parse(process.env.GOOGLE_APPLICATION_CREDENTIALS_JSON || '{}')
 
@@ -13,12 +14,84 @@ const auth = new google.auth.GoogleAuth({
 export const drive = google.drive({ version: 'v3', auth })
 export const sheets = google.sheets({ version: 'v4', auth })
 
-export async function listFiles(folderId?: string, query?: string) {
-  const response = await drive.files.list({
-    q: folderId ? `'${folderId}' in parents` : query,
-    fields: 'files(id,name,mimeType,size,modifiedTime,parents)'
-  })
-  return response.data.files || []
+const DEFAULT_FILE_FIELDS = 'id,name,mimeType,size,modifiedTime,parents'
+const FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+export interface ListFilesOptions {
+  folderId?: string
+  query?: string
+  pageSize?: number
+  // Field mask for each file, e.g. 'id,name' for list views
+  fields?: string
+}
+
+// Yields every matching file across all pages. The next page is requested
+// as soon as the current one arrives, so callers overlap their work with it.
+export async function* iterateFiles(options: ListFilesOptions = {}) {
+  const { folderId, query, pageSize = 1000, fields = DEFAULT_FILE_FIELDS } = options
+
+  const fetchPage = (pageToken?: string) => {
+    const request = drive.files.list({
+      q: folderId ? `'${folderId}' in parents` : query,
+      pageSize,
+      pageToken,
+      fields: `nextPageToken,files(${fields})`
+    })
+    // Avoid an unhandled rejection if the caller stops iterating early
+    request.catch(() => undefined)
+    return request
+  }
+
+  let nextPage: ReturnType<typeof fetchPage> | null = fetchPage()
+
+  while (nextPage) {
+    const response = await nextPage
+    const { nextPageToken, files } = response.data
+    nextPage = nextPageToken ? fetchPage(nextPageToken) : null
+
+    for (const file of files || []) {
+      yield file
+    }
+  }
+}
+
+export async function listFiles(folderId?: string, query?: string, options: Omit<ListFilesOptions, 'folderId' | 'query'> = {}) {
+  const files: drive_v3.Schema$File[] = []
+  for await (const file of iterateFiles({ ...options, folderId, query })) {
+    files.push(file)
+  }
+  return files
+}
+
+// Lists all files under a folder, listing up to `concurrency` subfolders at once
+export async function listFolderTree(
+  folderId: string,
+  options: { concurrency?: number, pageSize?: number, fields?: string } = {}
+) {
+  const { concurrency = 4, pageSize, fields = DEFAULT_FILE_FIELDS } = options
+  const limit = createLimiter(concurrency)
+  const files: drive_v3.Schema$File[] = []
+  // mimeType is needed to tell folders apart
+  const treeFields = fields.split(',').includes('mimeType') ? fields : `${fields},mimeType`
+
+  const visit = async (id: string): Promise<void> => {
+    const subfolders: string[] = []
+
+    await limit(async () => {
+      for await (const file of iterateFiles({ folderId: id, pageSize, fields: treeFields })) {
+        if (file.mimeType === FOLDER_MIME_TYPE) {
+          subfolders.push(file.id!)
+        } else {
+          files.push(file)
+        }
+      }
+    })
+
+    await Promise.all(subfolders.map(visit))
+  }
+
+  await visit(folderId)
+  return files
 }
 
 export async function downloadFile(fileId: string) {
@@ -29,6 +102,15 @@ export async function downloadFile(fileId: string) {
   return response.data
 }
 
+// Node stream of the file body, for piping large evidence without buffering it
+export async function downloadFileStream(fileId: string) {
+  const response = await drive.files.get(
+    { fileId, alt: 'media' },
+    { responseType: 'stream' }
+  )
+  return response.data
+}
+
 export async function getFileMetadata(fileId: string) {
   const response = await drive.files.get({
     fileId,
@@ -50,11 +132,12 @@ export async function readSheetData(spreadsheetId: string, range: string) {
   return response.data.values || []
 }
 
-export async function syncComplianceChecks(spreadsheetId: string) {
-  const data = await readSheetData(spreadsheetId, 'All Checks!A2:L1000')
+const CHECKS_SHEET = 'All Checks'
+const CHECKS_FIRST_ROW = 2
 
-  return data.map((row, index) => ({
-    sheet_row_id: index + 2,
+export function toComplianceCheck(row: any[], sheetRowId: number) {
+  return {
+    sheet_row_id: sheetRowId,
     check_type: row[0] || '',
     check_name: row[1] || '', 
     area: row[2] || '',
@@ -67,5 +150,34 @@ export async function syncComplianceChecks(spreadsheetId: string) {
     repetition: row[9] || '',
     collection_remarks: row[10] || '',
     spoc_comments: row[11] || ''
-  }))
+  }
+}
+
+// Yields the checks sheet in chunks of `chunkSize` rows, up to the sheet's
+// real row count. Blank rows are skipped.
+export async function* readComplianceCheckChunks(spreadsheetId: string, chunkSize = 2000) {
+  const spreadsheet = await sheets.spreadsheets.get({
+    spreadsheetId,
+    ranges: [CHECKS_SHEET],
+    fields: 'sheets(properties(gridProperties(rowCount)))'
+  })
+  const rowCount = spreadsheet.data.sheets?.[0]?.properties?.gridProperties?.rowCount || 0
+
+  for (let start = CHECKS_FIRST_ROW; start <= rowCount; start += chunkSize) {
+    const end = Math.min(start + chunkSize - 1, rowCount)
+    const rows = await readSheetData(spreadsheetId, `${CHECKS_SHEET}!A${start}:L${end}`)
+
+    yield rows
+      .map((row, index) => ({ row, sheetRowId: start + index }))
+      .filter(({ row }) => row.some(cell => cell !== ''))
+      .map(({ row, sheetRowId }) => toComplianceCheck(row, sheetRowId))
+  }
+}
+
+export async function syncComplianceChecks(spreadsheetId: string) {
+  const checks: ReturnType<typeof toComplianceCheck>[] = []
+  for await (const chunk of readComplianceCheckChunks(spreadsheetId)) {
+    checks.push(...chunk)
+  }
+  return checks
 }
@@ -0,0 +1,123 @@
+import { createHashEmbedder } from './embeddings'
+
+export type ChatIntent = 'change_folder' | 'pause' | 'explain' | 'skip_step' | 'help'
+
+export interface IntentResult {
+  intent: ChatIntent | null
+  confidence: number
+  // Whether the answer is certain enough to skip the model
+  confident: boolean
+  elapsedMs: number
+}
+
+// Example phrasings per intent; the first of each is the ChatInterface quick action
+const INTENT_EXAMPLES: Record<ChatIntent, string[]> = {
+  change_folder: [
+    'Change the search folder',
+    'Look in a different folder',
+    'Search another path',
+    'Use a different directory',
+    'The evidence is in another location'
+  ],
+  pause: [
+    'Pause collection',
+    'Stop collecting',
+    'Hold on',
+    'Stop for now',
+    'Halt the collection'
+  ],
+  explain: [
+    'Explain what you\'re doing',
+    'Explain this step',
+    'Tell me what you are doing',
+    'Describe the current step',
+    'Walk me through this'
+  ],
+  skip_step: [
+    'Skip this step',
+    'Skip it',
+    'Move on to the next step',
+    'Go to the next check',
+    'Ignore this one'
+  ],
+  help: [
+    'Help',
+    'Show me the commands',
+    'List the commands',
+    'Show help',
+    'I need help'
+  ]
+}
+
+const INTENT_KEYWORDS: Record<ChatIntent, RegExp> = {
+  change_folder: /\b(folder|path|directory|location)\b/,
+  pause: /\b(pause|stop|halt|hold on)\b/,
+  explain: /\b(explain|describe|walk me through)\b/,
+  skip_step: /\b(skip|next step|move on)\b/,
+  help: /\b(help|commands)\b/
+}
+
+// Longer messages usually carry detail ("pause, then look in /HR/2024")
+// that only the model can act on
+const MAX_FAST_PATH_WORDS = 8
+const NEGATION = /\b(don'?t|do not|not|never|no)\b/
+// Questions ("what folder are you in?", "can you skip this?") need a real
+// answer, not a canned reply
+const QUESTION = /\?|^(what|which|where|when|who|whose|how|why|is|are|am|can|could|does|do|did|will|would|should|has|have|was|were)\b/
+const MIN_SIMILARITY = 0.5
+const MIN_MARGIN = 0.1
+
+const embedder = createHashEmbedder(256)
+
+// Embedded at module load, so the first message doesn't pay for the examples
+const exampleEntries = Object.entries(INTENT_EXAMPLES).flatMap(([intent, phrases]) =>
+  phrases.map(phrase => ({ intent: intent as ChatIntent, phrase }))
+)
+const examples = embedder.embed(exampleEntries.map(entry => entry.phrase)).then(vectors =>
+  exampleEntries.map((entry, index) => ({ intent: entry.intent, vector: vectors[index] }))
+)
+
+const dot = (a: number[], b: number[]) => a.reduce((sum, value, index) => sum + value * b[index], 0)
+
+// Classifies a chat message locally, in well under 5ms after the first call
+// in a process. The nearest example phrase decides, and is only trusted when
+// it clearly beats the next-best intent and no keyword points at a different
+// one. A keyword alone never decides.
+export async function classifyIntent(message: string): Promise<IntentResult> {
+  const startedAt = performance.now()
+  const text = message.toLowerCase().trim()
+  const wordCount = text.split(/\s+/).filter(Boolean).length
+  const done = (intent: ChatIntent | null, confidence: number, confident: boolean): IntentResult => ({
+    intent,
+    confidence,
+    confident: confident && wordCount <= MAX_FAST_PATH_WORDS && !NEGATION.test(text) && !QUESTION.test(text),
+    elapsedMs: performance.now() - startedAt
+  })
+
+  const keywordHits = (Object.keys(INTENT_KEYWORDS) as ChatIntent[])
+    .filter(intent => INTENT_KEYWORDS[intent].test(text))
+
+  const [vector] = await embedder.embed([text])
+  const best = new Map<ChatIntent, number>()
+  for (const example of await examples) {
+    const similarity = dot(vector, example.vector)
+    if (similarity > (best.get(example.intent) ?? -1)) best.set(example.intent, similarity)
+  }
+
+  const [first, second] = [...best.entries()].sort((a, b) => b[1] - a[1])
+  const margin = first[1] - (second?.[1] ?? 0)
+  const confident = first[1] >= MIN_SIMILARITY && margin >= MIN_MARGIN
+    && keywordHits.every(intent => intent === first[0])
+
+  return done(first[1] > 0 ? first[0] : null, Math.max(0, first[1]), confident)
+}
+
+// Canned replies for confidently classified messages. Chat cannot yet pause,
+// skip or redirect a running collection, so these say so rather than claim it.
+export const INTENT_REPLIES: Record<ChatIntent, string> = {
+  change_folder: 'Changing the search location from chat isn\'t supported yet, so this collection keeps searching where it is. Tell me the folder you had in mind (for example /Compliance/HR/2024) and I can check whether it fits the current check.',
+  pause: 'Pausing from chat isn\'t supported yet, so collection is still running. Evidence for completed steps is already saved, and you can review it in this session.',
+  explain: 'I\'m collecting evidence for each selected check from its requirements and any learned collection pattern, looking for the most recent file that matches the expected naming convention. The progress panel shows the current step and what was found for each check.',
+  skip_step: 'Skipping steps from chat isn\'t supported yet, so this step will run to completion. If it finds nothing it is marked as an error, and you can collect that evidence manually.',
+  help: 'I can:\n\n• Explain what the current step is doing\n• Answer questions about this session\'s progress\n• Discuss where evidence for a check is likely to be\n\nPausing, skipping steps and changing search locations from chat aren\'t supported yet.'
+}
@@ -3,33 +3,56 @@ import { anthropic } from '@ai-sdk/anthropic'
 import { google } from '@ai-sdk/google'
 import { groq } from '@ai-sdk/groq'
 import { mistral } from '@ai-sdk/mistral'
+import type { LanguageModel } from 'ai'
+import { createLimiter, readConcurrency, type Limiter } from './concurrency'
+import { createRoutedModel, type RoutedModelOptions } from './llm-router'
+import { createOllama } from './ollama'
 
-// Ollama provider (community or custom implementation)
-const createOllama = (config: { baseURL: string }) => {
-  return (model: string) => ({
-    modelId: model,
-    doGenerate: async (options: any) => {
-      const response = await fetch(`${config.baseURL}/api/generate`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          model,
-          prompt: options.prompt,
-          stream: false
-        })
-      })
-      const data = await response.json()
-      return {
-        text: data.response,
-        usage: { promptTokens: 0, completionTokens: 0 }
-      }
-    }
-  })
-}
-
-export function getModel() {
-  const provider = process.env.AI_MODEL_PROVIDER || 'openai'
+const ollama = createOllama()
 
+export function getOllamaModelId() {
+  return process.env.OLLAMA_MODEL || 'llama3.1:8b'
+}
+
+export function getProviderName() {
+  return process.env.AI_MODEL_PROVIDER || 'openai'
+}
+
+// Providers the router may use, in preference order. AI_MODEL_PROVIDERS
+// (e.g. "openai,groq,ollama") enables failover; otherwise AI_MODEL_PROVIDER alone.
+export function getProviderNames() {
+  const names = (process.env.AI_MODEL_PROVIDERS || '')
+    .split(',')
+    .map(name => name.trim())
+    .filter(Boolean)
+  return names.length > 0 ? names : [getProviderName()]
+}
+
+// Max in-flight requests per provider, overridable with LLM_CONCURRENCY_<PROVIDER>
+const defaultProviderConcurrency: Record<string, number> = {
+  openai: 8,
+  anthropic: 4,
+  google: 4,
+  groq: 4,
+  mistral: 4,
+  ollama: 1
+}
+
+const providerLimiters = new Map<string, Limiter>()
+
+export function getProviderLimiter(provider = getProviderName()) {
+  let limiter = providerLimiters.get(provider)
+  if (!limiter) {
+    limiter = createLimiter(readConcurrency(
+      `LLM_CONCURRENCY_${provider.toUpperCase()}`,
+      defaultProviderConcurrency[provider] ?? 4
+    ))
+    providerLimiters.set(provider, limiter)
+  }
+  return limiter
+}
+
+export function getProviderModel(provider: string): LanguageModel {
   switch (provider) {
     case 'openai':
       return openai('gpt-4o-mini')
@@ -42,15 +65,22 @@ export function getModel() {
     case 'mistral':
       return mistral('mistral-large-latest')
     case 'ollama':
-      const ollamaClient = createOllama({ 
-        baseURL: process.env.OLLAMA_BASE_URL || 'http://localhost:11434' 
-      })
-      return ollamaClient('llama3.1:8b')
+      return ollama(getOllamaModelId())
     default:
       return openai('gpt-4o-mini')
   }
 }
 
+// Requests go through the per-provider limiter of whichever provider the
+// router picks, so callers don't need their own
+export function getModel(options: RoutedModelOptions = {}) {
+  return createRoutedModel(getProviderNames().map(name => ({
+    name,
+    model: getProviderModel(name),
+    limiter: getProviderLimiter(name)
+  })), options)
+}
+
 export function getEmbeddingModel() {
   return openai.embedding('text-embedding-ada-002')
 }
@@ -0,0 +1,324 @@
+import { APICallError, type LanguageModel } from 'ai'
+import type { Limiter } from './concurrency'
+
+export interface RoutedProvider {
+  name: string
+  model: LanguageModel
+  limiter: Limiter
+}
+
+interface Sample {
+  at: number
+  latencyMs: number
+  ok: boolean
+}
+
+interface ProviderHealth {
+  samples: Sample[]
+  cooldownUntil: number
+  routed: number
+  failovers: number
+}
+
+// Samples older than this no longer count, so a provider that had a bad
+// spell is tried again once it ages out
+const HEALTH_WINDOW_MS = 5 * 60 * 1000
+const MAX_SAMPLES = 100
+const DEFAULT_COOLDOWN_MS = 30 * 1000
+// Stands in for p95 when a provider has only failed recently, so it ranks
+// behind every provider that has answered
+const FAILING_PROVIDER_LATENCY_MS = 60 * 1000
+
+const health = new Map<string, ProviderHealth>()
+let lastDecision: { provider: string, reason: string, at: string } | null = null
+
+function getHealth(name: string) {
+  let entry = health.get(name)
+  if (!entry) {
+    entry = { samples: [], cooldownUntil: 0, routed: 0, failovers: 0 }
+    health.set(name, entry)
+  }
+  return entry
+}
+
+function recentSamples(entry: ProviderHealth) {
+  const cutoff = Date.now() - HEALTH_WINDOW_MS
+  entry.samples = entry.samples.filter(sample => sample.at >= cutoff)
+  return entry.samples
+}
+
+function percentile(values: number[], p: number) {
+  if (values.length === 0) return null
+  const sorted = [...values].sort((a, b) => a - b)
+  return sorted[Math.min(sorted.length - 1, Math.floor(p * sorted.length))]
+}
+
+function summarize(entry: ProviderHealth) {
+  const samples = recentSamples(entry)
+  const latencies = samples.filter(sample => sample.ok).map(sample => sample.latencyMs)
+  const errors = samples.filter(sample => !sample.ok).length
+  return {
+    samples: samples.length,
+    p50: percentile(latencies, 0.5),
+    p90: percentile(latencies, 0.9),
+    p95: percentile(latencies, 0.95),
+    errorRate: samples.length ? errors / samples.length : 0
+  }
+}
+
+// Expected cost of a request: tail latency inflated by the error rate.
+// Providers without samples score 0 so they get measured.
+function score(entry: ProviderHealth) {
+  const { p95, errorRate } = summarize(entry)
+  const latency = p95 ?? (errorRate > 0 ? FAILING_PROVIDER_LATENCY_MS : 0)
+  return latency * (1 + 4 * errorRate)
+}
+
+function record(name: string, startedAt: number, ok: boolean) {
+  const entry = getHealth(name)
+  entry.samples.push({ at: Date.now(), latencyMs: Date.now() - startedAt, ok })
+  if (entry.samples.length > MAX_SAMPLES) entry.samples.shift()
+}
+
+// 429 and 5xx (and network errors without a status) mean "try elsewhere";
+// other 4xx errors would fail the same way on any provider
+function isFailoverError(error: unknown) {
+  if (APICallError.isAPICallError(error)) {
+    const status = error.statusCode
+    return status === undefined || status === 429 || status >= 500
+  }
+  return !(error instanceof Error && error.name === 'AbortError')
+}
+
+function cooldownMs(error: unknown) {
+  if (APICallError.isAPICallError(error)) {
+    const retryAfter = Number(error.responseHeaders?.['retry-after'])
+    if (retryAfter > 0) return retryAfter * 1000
+  }
+  return DEFAULT_COOLDOWN_MS
+}
+
+// Configured order is the tie-breaker; cooling-down providers go last
+export function rankProviders(providers: RoutedProvider[]) {
+  const now = Date.now()
+  return providers
+    .map((provider, index) => ({ provider, index, entry: getHealth(provider.name) }))
+    .sort((a, b) => {
+      const aCooling = a.entry.cooldownUntil > now ? 1 : 0
+      const bCooling = b.entry.cooldownUntil > now ? 1 : 0
+      return aCooling - bCooling || score(a.entry) - score(b.entry) || a.index - b.index
+    })
+    .map(({ provider }) => provider)
+}
+
+// One attempt on one provider, recorded in its health window. Aborted
+// attempts (cancelled callers or losing hedges) are not counted either way.
+// onStart runs when the limiter lets the call through.
+async function callProvider<T>(
+  provider: RoutedProvider,
+  call: (model: LanguageModel) => PromiseLike<T>,
+  abortSignal?: AbortSignal,
+  onStart?: () => void
+): Promise<T> {
+  const entry = getHealth(provider.name)
+  entry.routed++
+
+  // Timed from when the limiter lets the call through, so queueing behind
+  // our own concurrency cap doesn't count as provider latency. For streams
+  // this measures time to first response.
+  let startedAt = Date.now()
+  try {
+    const result = await provider.limiter(async () => {
+      startedAt = Date.now()
+      onStart?.()
+      return await call(provider.model)
+    })
+    record(provider.name, startedAt, true)
+    return result
+  } catch (error) {
+    if (!abortSignal?.aborted && isFailoverError(error)) {
+      record(provider.name, startedAt, false)
+      entry.cooldownUntil = Date.now() + cooldownMs(error)
+      entry.failovers++
+    }
+    throw error
+  }
+}
+
+async function route<T>(
+  providers: RoutedProvider[],
+  call: (model: LanguageModel) => PromiseLike<T>,
+  abortSignal?: AbortSignal
+): Promise<T> {
+  const ranked = rankProviders(providers)
+  let lastError: unknown
+
+  for (const [attempt, provider] of ranked.entries()) {
+    lastDecision = {
+      provider: provider.name,
+      reason: attempt === 0 ? 'healthiest' : `failover from ${ranked[attempt - 1].name}`,
+      at: new Date().toISOString()
+    }
+
+    try {
+      return await callProvider(provider, call, abortSignal)
+    } catch (error) {
+      if (abortSignal?.aborted || !isFailoverError(error)) throw error
+      lastError = error
+    }
+  }
+
+  throw lastError
+}
+
+// Hedges may be at most this fraction of hedgeable requests in the health
+// window, counting the hedge being asked for, which bounds the extra spend
+// (0 disables hedging)
+const HEDGE_BUDGET = Math.min(1, Math.max(0, Number(process.env.LLM_HEDGE_BUDGET) || 0))
+
+const hedgeStats = { requests: [] as number[], hedges: [] as number[], wins: 0 }
+
+function takeHedgeBudget() {
+  const cutoff = Date.now() - HEALTH_WINDOW_MS
+  hedgeStats.requests = hedgeStats.requests.filter(at => at >= cutoff)
+  hedgeStats.hedges = hedgeStats.hedges.filter(at => at >= cutoff)
+  if (hedgeStats.hedges.length + 1 > HEDGE_BUDGET * hedgeStats.requests.length) return false
+  hedgeStats.hedges.push(Date.now())
+  return true
+}
+
+// Sends the request to the healthiest provider and, if it hasn't answered
+// within its own p90 of being let through its limiter, the same request to
+// the runner-up. The first answer wins and the other request is aborted.
+// A primary failure before the hedge fires fails over to the runner-up
+// immediately.
+function hedgedRoute<T>(
+  providers: RoutedProvider[],
+  call: (model: LanguageModel, abortSignal?: AbortSignal) => PromiseLike<T>,
+  abortSignal?: AbortSignal
+): Promise<T> {
+  const now = Date.now()
+  const ranked = rankProviders(providers).filter(provider => getHealth(provider.name).cooldownUntil <= now)
+  const hedgeAfterMs = ranked.length > 1 ? summarize(getHealth(ranked[0].name)).p90 : null
+
+  if (HEDGE_BUDGET === 0 || hedgeAfterMs === null) {
+    return route(providers, model => call(model, abortSignal), abortSignal)
+  }
+
+  const [primary, backup] = ranked
+  hedgeStats.requests.push(now)
+  lastDecision = { provider: primary.name, reason: `healthiest, hedge to ${backup.name} after ${hedgeAfterMs}ms`, at: new Date().toISOString() }
+
+  return new Promise<T>((resolve, reject) => {
+    const controllers: AbortController[] = []
+    let timer: ReturnType<typeof setTimeout> | undefined
+    let running = 0
+    let settled = false
+    let backupStarted = false
+
+    const abortAll = () => controllers.forEach(controller => controller.abort())
+    abortSignal?.addEventListener('abort', abortAll, { once: true })
+
+    const finish = (outcome: () => void) => {
+      if (settled) return
+      settled = true
+      clearTimeout(timer)
+      abortSignal?.removeEventListener('abort', abortAll)
+      abortAll()
+      outcome()
+    }
+
+    const launch = (provider: RoutedProvider, hedged: boolean, onStart?: () => void) => {
+      const controller = new AbortController()
+      controllers.push(controller)
+      running++
+
+      callProvider(provider, model => call(model, controller.signal), controller.signal, onStart).then(
+        result => finish(() => {
+          if (hedged) hedgeStats.wins++
+          lastDecision = { provider: provider.name, reason: hedged ? 'hedge won' : 'primary won', at: new Date().toISOString() }
+          resolve(result)
+        }),
+        error => {
+          running--
+          if (settled) return
+          if (!backupStarted && !abortSignal?.aborted && isFailoverError(error)) {
+            startBackup(false)
+          } else if (running === 0 || !isFailoverError(error)) {
+            finish(() => reject(error))
+          }
+        }
+      )
+    }
+
+    const startBackup = (hedged: boolean) => {
+      if (backupStarted || settled) return
+      backupStarted = true
+      clearTimeout(timer)
+      launch(backup, hedged)
+    }
+
+    // p90 is measured from admission, so time spent queued behind the
+    // primary's limiter doesn't count towards the hedge delay
+    launch(primary, false, () => {
+      if (settled || backupStarted || abortSignal?.aborted) return
+      timer = setTimeout(() => {
+        if (takeHedgeBudget()) startBackup(true)
+      }, hedgeAfterMs)
+    })
+  })
+}
+
+export interface RoutedModelOptions {
+  // Race a second provider when the first is slower than its p90
+  hedge?: boolean
+}
+
+type GenerateOptions = Parameters<LanguageModel['doGenerate']>[0]
+
+// Reports the model that actually answered as response.modelId, so callers
+// keyed on the model (e.g. the plan cache) can tell a failover answer apart
+async function generateWith(model: LanguageModel, callOptions: GenerateOptions) {
+  const result = await model.doGenerate(callOptions)
+  return { ...result, response: { ...result.response, modelId: model.modelId } }
+}
+
+// A LanguageModel that sends each request to the healthiest provider and
+// fails over on 429/5xx. With one provider it only adds limiting and metrics.
+// The model id is the first provider's, so plan cache keys stay stable; the
+// serving provider's id is in each generate result's response.modelId.
+export function createRoutedModel(providers: RoutedProvider[], options: RoutedModelOptions = {}): LanguageModel {
+  const primary = providers[0].model
+
+  return {
+    specificationVersion: 'v1',
+    provider: providers.length === 1 ? primary.provider : 'router',
+    modelId: primary.modelId,
+    defaultObjectGenerationMode: primary.defaultObjectGenerationMode,
+    doGenerate: callOptions => options.hedge
+      ? hedgedRoute(providers, (model, abortSignal) => generateWith(model, { ...callOptions, abortSignal }), callOptions.abortSignal)
+      : route(providers, model => generateWith(model, callOptions), callOptions.abortSignal),
+    doStream: callOptions => route(providers, model => model.doStream(callOptions), callOptions.abortSignal)
+  }
+}
+
+// Health and routing counters for every provider seen in this instance
+export function getRouterMetrics() {
+  const now = Date.now()
+  return {
+    lastDecision,
+    hedging: {
+      budget: HEDGE_BUDGET,
+      requests: hedgeStats.requests.length,
+      hedges: hedgeStats.hedges.length,
+      wins: hedgeStats.wins
+    },
+    providers: Object.fromEntries([...health.entries()].map(([name, entry]) => [name, {
+      ...summarize(entry),
+      routed: entry.routed,
+      failovers: entry.failovers,
+      coolingDown: entry.cooldownUntil > now,
+      score: score(entry)
+    }]))
+  }
+}
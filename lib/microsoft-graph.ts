@@ -1,10 +1,43 @@
 import { Client } from '@microsoft/microsoft-graph-client'
 import { AuthenticationProvider } from '@microsoft/microsoft-graph-client'
 
+// Refresh this long before expires_in so requests never wait on a token
+const TOKEN_REFRESH_MARGIN_MS = 5 * 60 * 1000
+
 class CustomAuthProvider implements AuthenticationProvider {
+  private token: { value: string, expiresAt: number } | null = null
+  private refreshing: Promise<string> | null = null
+  readonly stats = { hits: 0, misses: 0, refreshes: 0 }
+
   async getAccessToken(): Promise<string> {
-    // Implement OAuth2 flow or use client credentials
-    const tokenResponse = await fetch('https://login.microsoftonline.com/{tenant}/oauth2/v2.0/token', {
+    const now = Date.now()
+
+    if (this.token && now < this.token.expiresAt) {
+      this.stats.hits++
+      if (now >= this.token.expiresAt - TOKEN_REFRESH_MARGIN_MS) {
+        // Still valid: serve it and refresh in the background
+        this.refresh().catch(error => console.error('Graph token refresh error:', error))
+      }
+      return this.token.value
+    }
+
+    this.stats.misses++
+    return await this.refresh()
+  }
+
+  // Concurrent callers share one in-flight token request
+  private refresh() {
+    if (!this.refreshing) {
+      this.refreshing = this.requestToken().finally(() => {
+        this.refreshing = null
+      })
+    }
+    return this.refreshing
+  }
+
+  private async requestToken() {
+    this.stats.refreshes++
+    const tokenResponse = await fetch(`https://login.microsoftonline.com/${process.env.MS_TENANT_ID}/oauth2/v2.0/token`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
       body: new URLSearchParams({
@@ -16,21 +49,55 @@ class CustomAuthProvider implements AuthenticationProvider {
     })
 
     const data = await tokenResponse.json()
-    return data.access_token
+    if (!tokenResponse.ok) {
+      throw new Error(`Graph token request failed: ${data.error_description || tokenResponse.status}`)
+    }
+
+    this.token = {
+      value: data.access_token,
+      expiresAt: Date.now() + data.expires_in * 1000
+    }
+    return data.access_token as string
   }
 }
 
+const authProvider = new CustomAuthProvider()
+
+export function getGraphTokenStats() {
+  return { ...authProvider.stats }
+}
+
 export const graphClient = Client.initWithMiddleware({
-  authProvider: new CustomAuthProvider()
+  authProvider
 })
 
+// Yields every item of a Graph collection, following @odata.nextLink
+export async function* iterateGraphCollection(endpoint: string) {
+  let next: string | undefined = endpoint
+
+  while (next) {
+    const response = await graphClient.api(next).get()
+    for (const item of response.value || []) {
+      yield item
+    }
+    next = response['@odata.nextLink']
+  }
+}
+
+async function collectGraphCollection(endpoint: string) {
+  const items: any[] = []
+  for await (const item of iterateGraphCollection(endpoint)) {
+    items.push(item)
+  }
+  return items
+}
+
 export async function listOneDriveFiles(path?: string) {
   const endpoint = path 
     ? `/me/drive/root:/${path}:/children`
     : '/me/drive/root/children'
 
-  const response = await graphClient.api(endpoint).get()
-  return response.value || []
+  return await collectGraphCollection(`${endpoint}?$top=999`)
 }
 
 export async function downloadOneDriveFile(itemId: string) {
@@ -38,7 +105,11 @@ export async function downloadOneDriveFile(itemId: string) {
   return response
 }
 
+// Stream of the item body, for piping large evidence without buffering it
+export async function downloadOneDriveFileStream(itemId: string) {
+  return await graphClient.api(`/me/drive/items/${itemId}/content`).getStream()
+}
+
 export async function searchOneDriveFiles(query: string) {
-  const response = await graphClient.api(`/me/drive/root/search(q='${query}')`).get()
-  return response.value || []
+  return await collectGraphCollection(`/me/drive/root/search(q='${query}')`)
 }
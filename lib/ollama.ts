@@ -0,0 +1,197 @@
+import { APICallError, type LanguageModel } from 'ai'
+
+type CallOptions = Parameters<LanguageModel['doGenerate']>[0]
+type StreamPart = Awaited<ReturnType<LanguageModel['doStream']>>['stream'] extends ReadableStream<infer P> ? P : never
+
+export interface OllamaConfig {
+  baseURL?: string
+  // How long Ollama keeps the model loaded after a request (e.g. '30m', -1 = forever)
+  keepAlive?: string | number
+}
+
+const NS_PER_MS = 1e6
+
+// Ollama takes a bare number as seconds (-1 keeps the model loaded forever)
+// but rejects "-1" as a duration string, so numeric env values go as numbers
+function readKeepAlive(config: OllamaConfig) {
+  const keepAlive = config.keepAlive ?? process.env.OLLAMA_KEEP_ALIVE ?? '30m'
+  return typeof keepAlive === 'string' && /^-?\d+$/.test(keepAlive.trim()) ? Number(keepAlive) : keepAlive
+}
+
+// Requests go through Node's global fetch, whose pool keeps connections to
+// the Ollama origin alive between calls, so there is no per-request handshake.
+export function createOllama(config: OllamaConfig = {}) {
+  const baseURL = config.baseURL || process.env.OLLAMA_BASE_URL || 'http://localhost:11434'
+  const keepAlive = readKeepAlive(config)
+
+  const post = async (path: string, body: Record<string, unknown>, abortSignal?: AbortSignal) => {
+    const url = `${baseURL}${path}`
+    const response = await fetch(url, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(body),
+      signal: abortSignal
+    })
+
+    if (!response.ok) {
+      throw new APICallError({
+        message: `Ollama request failed: ${response.status}`,
+        url,
+        requestBodyValues: body,
+        statusCode: response.status,
+        responseHeaders: Object.fromEntries(response.headers.entries()),
+        responseBody: await response.text(),
+        isRetryable: response.status === 429 || response.status >= 500
+      })
+    }
+
+    return response
+  }
+
+  return (modelId: string): LanguageModel => {
+    const chatBody = (options: CallOptions, stream: boolean) => ({
+      model: modelId,
+      messages: toOllamaMessages(options.prompt),
+      stream,
+      keep_alive: keepAlive,
+      format: options.mode.type === 'object-json' ? 'json' : undefined,
+      options: {
+        temperature: options.temperature,
+        top_p: options.topP,
+        top_k: options.topK,
+        num_predict: options.maxTokens,
+        stop: options.stopSequences,
+        seed: options.seed
+      }
+    })
+
+    return {
+      specificationVersion: 'v1',
+      provider: 'ollama',
+      modelId,
+      defaultObjectGenerationMode: 'json',
+
+      async doGenerate(options) {
+        const body = chatBody(options, false)
+        const response = await post('/api/chat', body, options.abortSignal)
+        const data = await response.json()
+
+        return {
+          text: data.message?.content ?? '',
+          finishReason: toFinishReason(data.done_reason),
+          usage: toUsage(data),
+          providerMetadata: { ollama: toTimings(data) },
+          rawCall: { rawPrompt: body.messages, rawSettings: body.options }
+        }
+      },
+
+      async doStream(options) {
+        const body = chatBody(options, true)
+        const response = await post('/api/chat', body, options.abortSignal)
+
+        // Ollama streams one JSON object per line; the last has done: true
+        // and carries the token counts and timings
+        let buffered = ''
+        const stream = response.body!
+          .pipeThrough(new TextDecoderStream())
+          .pipeThrough(new TransformStream<string, StreamPart>({
+            transform(text, controller) {
+              buffered += text
+              const lines = buffered.split('\n')
+              buffered = lines.pop()!
+              lines.forEach(line => enqueueChunk(line, controller))
+            },
+            flush(controller) {
+              enqueueChunk(buffered, controller)
+            }
+          }))
+
+        return { stream, rawCall: { rawPrompt: body.messages, rawSettings: body.options } }
+      }
+    }
+  }
+}
+
+// Loads the model into memory and keeps it resident, so the first real
+// request doesn't pay the load time. An empty prompt loads without generating.
+export async function warmOllamaModel(modelId: string, config: OllamaConfig = {}) {
+  const baseURL = config.baseURL || process.env.OLLAMA_BASE_URL || 'http://localhost:11434'
+  const startedAt = Date.now()
+
+  const response = await fetch(`${baseURL}/api/generate`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({
+      model: modelId,
+      prompt: '',
+      keep_alive: readKeepAlive(config)
+    })
+  })
+
+  if (!response.ok) {
+    throw new Error(`Failed to warm Ollama model ${modelId}: ${response.status} ${await response.text()}`)
+  }
+
+  await response.json()
+  return { modelId, durationMs: Date.now() - startedAt }
+}
+
+function enqueueChunk(line: string, controller: TransformStreamDefaultController<StreamPart>) {
+  if (!line.trim()) return
+  const chunk = JSON.parse(line)
+
+  if (chunk.error) {
+    controller.enqueue({ type: 'error', error: new Error(chunk.error) })
+  } else if (chunk.done) {
+    controller.enqueue({
+      type: 'finish',
+      finishReason: toFinishReason(chunk.done_reason),
+      usage: toUsage(chunk),
+      providerMetadata: { ollama: toTimings(chunk) }
+    })
+  } else if (chunk.message?.content) {
+    controller.enqueue({ type: 'text-delta', textDelta: chunk.message.content })
+  }
+}
+
+function toOllamaMessages(prompt: CallOptions['prompt']) {
+  return prompt.map(message => {
+    if (message.role === 'system') {
+      return { role: 'system', content: message.content }
+    }
+
+    const content = message.content
+      .map((part: any) => {
+        if (part.type === 'text') return part.text
+        if (part.type === 'tool-result') return JSON.stringify(part.result)
+        return ''
+      })
+      .join('')
+
+    return { role: message.role === 'tool' ? 'tool' : message.role, content }
+  })
+}
+
+function toFinishReason(doneReason?: string) {
+  if (doneReason === 'length') return 'length' as const
+  if (doneReason === 'stop' || !doneReason) return 'stop' as const
+  return 'other' as const
+}
+
+function toUsage(data: any) {
+  return {
+    promptTokens: data.prompt_eval_count ?? 0,
+    completionTokens: data.eval_count ?? 0
+  }
+}
+
+// Ollama reports durations in nanoseconds
+function toTimings(data: any) {
+  const evalMs = (data.eval_duration ?? 0) / NS_PER_MS
+  return {
+    loadDurationMs: (data.load_duration ?? 0) / NS_PER_MS,
+    promptEvalDurationMs: (data.prompt_eval_duration ?? 0) / NS_PER_MS,
+    evalDurationMs: evalMs,
+    tokensPerSecond: evalMs > 0 ? (data.eval_count ?? 0) / (evalMs / 1000) : 0
+  }
+}
@@ -0,0 +1,169 @@
+import { supabaseAdmin } from './supabase'
+import { graphClient } from './microsoft-graph'
+import { globToLikePattern } from './drive-index'
+
+const DELTA_ENDPOINT = '/me/drive/root/delta?$select=id,name,parentReference,file,folder,lastModifiedDateTime,size,deleted'
+
+export interface DeltaPage {
+  value?: any[]
+  '@odata.nextLink'?: string
+  '@odata.deltaLink'?: string
+}
+
+// Fetches one delta page by URL. Swap in a local implementation to exercise
+// syncOneDriveIndex without Graph.
+export type DeltaPageFetcher = (url: string) => Promise<DeltaPage>
+
+export const fetchGraphDeltaPage: DeltaPageFetcher = url => graphClient.api(url).get()
+
+// Where the index and its delta link are kept, per drive
+export interface OneDriveIndexStore {
+  getDeltaLink(driveKey: string): Promise<string | null>
+  saveDeltaLink(driveKey: string, deltaLink: string): Promise<void>
+  upsertItems(driveKey: string, items: any[]): Promise<void>
+  removeItems(driveKey: string, itemIds: string[]): Promise<void>
+  // Forgets the drive's items and delta link so the next sync starts over
+  reset(driveKey: string): Promise<void>
+}
+
+const toIndexRow = (driveKey: string, item: any) => ({
+  drive_key: driveKey,
+  id: item.id,
+  name: item.name,
+  parent_id: item.parentReference?.id ?? null,
+  is_folder: !!item.folder,
+  mime_type: item.file?.mimeType ?? null,
+  last_modified: item.lastModifiedDateTime ?? null,
+  size: item.size ?? null,
+  quick_xor_hash: item.file?.hashes?.quickXorHash ?? null,
+  indexed_at: new Date().toISOString()
+})
+
+export const supabaseOneDriveIndex: OneDriveIndexStore = {
+  async getDeltaLink(driveKey) {
+    const { data, error } = await supabaseAdmin
+      .from('onedrive_sync_state')
+      .select('delta_link')
+      .eq('drive_key', driveKey)
+      .maybeSingle()
+
+    if (error) throw error
+    return data?.delta_link ?? null
+  },
+
+  async saveDeltaLink(driveKey, deltaLink) {
+    const { error } = await supabaseAdmin
+      .from('onedrive_sync_state')
+      .upsert({ drive_key: driveKey, delta_link: deltaLink }, { onConflict: 'drive_key' })
+    if (error) throw error
+  },
+
+  async upsertItems(driveKey, items) {
+    if (items.length === 0) return
+    const { error } = await supabaseAdmin
+      .from('onedrive_item_index')
+      .upsert(items.map(item => toIndexRow(driveKey, item)), { onConflict: 'drive_key,id' })
+    if (error) throw error
+  },
+
+  async removeItems(driveKey, itemIds) {
+    if (itemIds.length === 0) return
+    const { error } = await supabaseAdmin
+      .from('onedrive_item_index')
+      .delete()
+      .eq('drive_key', driveKey)
+      .in('id', itemIds)
+    if (error) throw error
+  },
+
+  async reset(driveKey) {
+    const { error: stateError } = await supabaseAdmin
+      .from('onedrive_sync_state')
+      .delete()
+      .eq('drive_key', driveKey)
+    if (stateError) throw stateError
+
+    const { error } = await supabaseAdmin
+      .from('onedrive_item_index')
+      .delete()
+      .eq('drive_key', driveKey)
+    if (error) throw error
+  }
+}
+
+// Graph can return the same item more than once in a delta response, and
+// only the last occurrence is its current state. Splitting into upserts and
+// deletes would otherwise let a stale entry win.
+export function latestDeltaPerItem(items: any[]) {
+  const latest = new Map<string, any>()
+  for (const item of items) {
+    latest.delete(item.id)
+    latest.set(item.id, item)
+  }
+  return Array.from(latest.values())
+}
+
+// Brings onedrive_item_index up to date. With a saved delta link this is a
+// single small request when nothing changed; the first run enumerates once.
+export async function syncOneDriveIndex(
+  fetchPage: DeltaPageFetcher = fetchGraphDeltaPage,
+  driveKey = 'default',
+  store: OneDriveIndexStore = supabaseOneDriveIndex
+): Promise<{ upserted: number, removed: number, full: boolean }> {
+  const savedLink = await store.getDeltaLink(driveKey)
+
+  let next: string | undefined = savedLink || DELTA_ENDPOINT
+  let upserted = 0
+  let removed = 0
+
+  try {
+    while (next) {
+      const page = await fetchPage(next)
+      const items = latestDeltaPerItem(page.value || [])
+      const live = items.filter(item => !item.deleted && item.name)
+      const deleted = items.filter(item => item.deleted).map(item => item.id)
+
+      await store.upsertItems(driveKey, live)
+      await store.removeItems(driveKey, deleted)
+      upserted += live.length
+      removed += deleted.length
+
+      if (page['@odata.deltaLink']) {
+        await store.saveDeltaLink(driveKey, page['@odata.deltaLink'])
+      }
+
+      next = page['@odata.nextLink']
+    }
+  } catch (graphError: any) {
+    // 410 Gone: the delta link expired and Graph requires a full resync
+    if (graphError?.statusCode === 410 && savedLink) {
+      await store.reset(driveKey)
+      return await syncOneDriveIndex(fetchPage, driveKey, store)
+    }
+    throw graphError
+  }
+
+  return { upserted, removed, full: !savedLink }
+}
+
+export async function searchOneDriveIndex(
+  pattern: string,
+  options: { driveKey?: string, parentId?: string, limit?: number } = {}
+) {
+  let query = supabaseAdmin
+    .from('onedrive_item_index')
+    .select('id, name, parent_id, mime_type, last_modified, size, quick_xor_hash')
+    .eq('drive_key', options.driveKey ?? 'default')
+    .eq('is_folder', false)
+    .ilike('name', globToLikePattern(pattern))
+    .order('last_modified', { ascending: false })
+    .limit(options.limit ?? 100)
+
+  if (options.parentId) {
+    query = query.eq('parent_id', options.parentId)
+  }
+
+  const { data, error } = await query
+  if (error) throw error
+  return data || []
+}
@@ -0,0 +1,40 @@
+import { isUuid } from './validation'
+
+// Opaque keyset cursors over (created_at, id), newest first
+
+export interface Cursor {
+  createdAt: string
+  id: string
+}
+
+export function encodeCursor(row: { created_at: string, id: string }) {
+  return Buffer.from(JSON.stringify([row.created_at, row.id])).toString('base64url')
+}
+
+// Timestamps as Postgres returns them, e.g. 2025-09-17T10:00:00.123456+00:00
+const TIMESTAMP_PATTERN = /^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{1,6})?(Z|[+-]\d{2}(:?\d{2})?)$/
+
+const isTimestamp = (value: unknown): value is string =>
+  typeof value === 'string' && TIMESTAMP_PATTERN.test(value) && !Number.isNaN(Date.parse(value))
+
+// Both values are spliced into a PostgREST filter, so anything that is not a
+// timestamp and a uuid is rejected rather than passed through
+export function decodeCursor(cursor: string | null): Cursor | null {
+  if (!cursor) return null
+  try {
+    const [createdAt, id] = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'))
+    return isTimestamp(createdAt) && isUuid(id) ? { createdAt, id } : null
+  } catch {
+    return null
+  }
+}
+
+// PostgREST filter for rows strictly after the cursor in (created_at desc, id desc) order
+export function keysetFilter(cursor: Cursor) {
+  return `created_at.lt."${cursor.createdAt}",and(created_at.eq."${cursor.createdAt}",id.lt.${cursor.id})`
+}
+
+export function readLimit(value: string | null, fallback = 50, max = 500) {
+  const limit = parseInt(value || '', 10)
+  return Number.isFinite(limit) && limit > 0 ? Math.min(limit, max) : fallback
+}
@@ -0,0 +1,107 @@
+import crypto from 'crypto'
+import { supabaseAdmin } from './supabase'
+
+// Bump when the planning prompt changes so cached plans are regenerated
+export const PLAN_PROMPT_VERSION = 1
+
+const PLAN_CACHE_TTL_DAYS = parseInt(process.env.PLAN_CACHE_TTL_DAYS || '90', 10) || 90
+
+const stats = { hits: 0, misses: 0, errors: 0 }
+
+export function buildCollectionPrompt(check: any) {
+  return `
+    Plan evidence collection for compliance check:
+    - Check Type: ${check.check_type}
+    - Check Name: ${check.check_name}
+    - Area: ${check.area}
+    - Collection Remarks: ${check.collection_remarks}
+
+    Provide a step-by-step plan to collect evidence.
+  `
+}
+
+export function planFingerprint(check: any, modelId: string) {
+  return crypto
+    .createHash('sha256')
+    .update(JSON.stringify([
+      PLAN_PROMPT_VERSION,
+      modelId,
+      check.check_type ?? '',
+      check.check_name ?? '',
+      check.area ?? '',
+      check.collection_remarks ?? ''
+    ]))
+    .digest('hex')
+}
+
+// Returns the cached plan for this check/model, or generates and stores one.
+// Cache failures fall back to generating, never fail the collection.
+// generate reports the model that answered; a plan from a different model
+// (e.g. after a router failover) is used but not cached under this model.
+export async function getCollectionPlan(
+  check: any,
+  modelId: string,
+  generate: (prompt: string) => Promise<{ text: string, modelId: string }>
+) {
+  const fingerprint = planFingerprint(check, modelId)
+
+  const { data: cachedPlan, error } = await supabaseAdmin
+    .rpc('get_cached_plan', { p_fingerprint: fingerprint })
+
+  if (error) {
+    stats.errors++
+    console.error('Plan cache read error:', error)
+  } else if (cachedPlan) {
+    stats.hits++
+    return { plan: cachedPlan as string, cached: true }
+  }
+
+  stats.misses++
+  const { text: plan, modelId: servedModelId } = await generate(buildCollectionPrompt(check))
+
+  if (servedModelId !== modelId) {
+    return { plan, cached: false }
+  }
+
+  const { error: writeError } = await supabaseAdmin
+    .from('collection_plan_cache')
+    .upsert({
+      fingerprint,
+      model_id: modelId,
+      prompt_version: PLAN_PROMPT_VERSION,
+      check_type: check.check_type,
+      check_name: check.check_name,
+      plan,
+      hit_count: 0,
+      created_at: new Date().toISOString(),
+      last_hit_at: null,
+      expires_at: new Date(Date.now() + PLAN_CACHE_TTL_DAYS * 24 * 60 * 60 * 1000).toISOString()
+    }, { onConflict: 'fingerprint' })
+
+  if (writeError) {
+    stats.errors++
+    console.error('Plan cache write error:', writeError)
+  }
+
+  return { plan, cached: false }
+}
+
+export async function invalidateCollectionPlans(filter: { checkType?: string, checkNames?: string[], modelId?: string } = {}) {
+  let query = supabaseAdmin
+    .from('collection_plan_cache')
+    .delete()
+    .lte('prompt_version', PLAN_PROMPT_VERSION)
+
+  if (filter.checkType) query = query.eq('check_type', filter.checkType)
+  if (filter.checkNames) query = query.in('check_name', filter.checkNames)
+  if (filter.modelId) query = query.eq('model_id', filter.modelId)
+
+  const { error } = await query
+  if (error) throw error
+}
+
+// In-process counters; persistent per-entry hit counts live in collection_plan_cache_stats
+export function getPlanCacheStats() {
+  const lookups = stats.hits + stats.misses
+  return { ...stats, hitRate: lookups > 0 ? stats.hits / lookups : 0 }
+}
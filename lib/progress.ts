@@ -0,0 +1,58 @@
+import { supabaseAdmin } from './supabase'
+
+export interface ProgressStep {
+  step: number
+  title: string
+  status: 'pending' | 'in_progress' | 'completed' | 'error' | 'skipped'
+  message: string
+  timestamp?: string
+  eventId?: number
+}
+
+// Appends one event per step change; safe to call from parallel workers
+export async function recordProgress(sessionId: string, steps: ProgressStep | ProgressStep[]) {
+  const events = (Array.isArray(steps) ? steps : [steps]).map(step => ({
+    session_id: sessionId,
+    step: step.step,
+    title: step.title,
+    status: step.status,
+    message: step.message,
+    ...(step.timestamp && { created_at: step.timestamp })
+  }))
+
+  const { error } = await supabaseAdmin
+    .from('session_progress_events')
+    .insert(events)
+
+  if (error) throw error
+}
+
+export async function getSessionProgress(sessionId: string): Promise<ProgressStep[]> {
+  const { data, error } = await supabaseAdmin
+    .from('session_progress_steps')
+    .select('step, title, status, message, last_event_id, updated_at')
+    .eq('session_id', sessionId)
+    .order('step', { ascending: true })
+
+  if (error) throw error
+
+  return (data || []).map((row: any) => ({
+    step: row.step,
+    title: row.title,
+    status: row.status,
+    message: row.message,
+    timestamp: row.updated_at,
+    eventId: row.last_event_id
+  }))
+}
+
+export function toProgressStep(row: any): ProgressStep {
+  return {
+    step: row.step,
+    title: row.title,
+    status: row.status,
+    message: row.message,
+    timestamp: row.created_at,
+    eventId: row.id
+  }
+}
@@ -0,0 +1,76 @@
+import crypto from 'crypto'
+import { supabaseAdmin } from './supabase'
+import { readComplianceCheckChunks } from './google-drive'
+import { invalidateCollectionPlans } from './plan-cache'
+
+const UPSERT_BATCH_SIZE = 500
+
+function hashCheck(check: Record<string, unknown>) {
+  const { sheet_row_id, ...fields } = check
+  return crypto.createHash('sha256').update(JSON.stringify(fields)).digest('hex')
+}
+
+// Syncs the master sheet into compliance_checks, writing only rows whose
+// content changed and soft-deleting rows that disappeared from the sheet
+export async function syncComplianceChecksFromSheet(spreadsheetId: string, chunkSize?: number) {
+  const { data: storedHashes, error } = await supabaseAdmin.rpc('get_compliance_check_hashes')
+  if (error) throw error
+
+  const previous = new Map<string, string | null>(Object.entries(storedHashes || {}))
+  const seen = new Set<string>()
+  const edited = new Set<string>()
+  let changed: Record<string, unknown>[] = []
+  let scanned = 0
+  let upserted = 0
+
+  const flush = async () => {
+    if (changed.length === 0) return
+    const { error: upsertError } = await supabaseAdmin
+      .from('compliance_checks')
+      .upsert(changed, { onConflict: 'sheet_row_id' })
+    if (upsertError) throw upsertError
+    upserted += changed.length
+    changed = []
+  }
+
+  for await (const chunk of readComplianceCheckChunks(spreadsheetId, chunkSize)) {
+    for (const check of chunk) {
+      const rowId = String(check.sheet_row_id)
+      const contentHash = hashCheck(check)
+      scanned++
+      seen.add(rowId)
+
+      if (previous.get(rowId) !== contentHash) {
+        changed.push({ ...check, content_hash: contentHash, deleted_at: null })
+        if (previous.has(rowId) && check.check_name) edited.add(String(check.check_name))
+      }
+    }
+
+    if (changed.length >= UPSERT_BATCH_SIZE) await flush()
+  }
+  await flush()
+
+  const removed = Array.from(previous.keys())
+    .filter(rowId => !seen.has(rowId))
+    .map(Number)
+
+  for (let i = 0; i < removed.length; i += UPSERT_BATCH_SIZE) {
+    const { error: deleteError } = await supabaseAdmin
+      .from('compliance_checks')
+      .update({ deleted_at: new Date().toISOString() })
+      .in('sheet_row_id', removed.slice(i, i + UPSERT_BATCH_SIZE))
+    if (deleteError) throw deleteError
+  }
+
+  // Plan cache keys include the check fields, so an edited check never gets
+  // a stale plan; this drops the entries its old definition left behind.
+  // A cache failure shouldn't fail the sync.
+  const editedNames = Array.from(edited)
+  for (let i = 0; i < editedNames.length; i += UPSERT_BATCH_SIZE) {
+    await invalidateCollectionPlans({ checkNames: editedNames.slice(i, i + UPSERT_BATCH_SIZE) }).catch(cacheError => {
+      console.error('Plan cache invalidation error:', cacheError)
+    })
+  }
+
+  return { scanned, upserted, deleted: removed.length }
+}
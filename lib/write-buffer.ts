@@ -0,0 +1,93 @@
+// Write-behind buffer: coalesces rows and writes them in batches, flushed
+// when the batch is full or the oldest row has waited flushIntervalMs.
+// add() resolves once the row's batch is written, so callers that need
+// durability can await it and callers that don't can defer to flush().
+
+interface BufferedEntry<T> {
+  row: T
+  waiters: { resolve: () => void, reject: (error: unknown) => void }[]
+}
+
+export interface WriteBufferOptions<T> {
+  write: (rows: T[]) => Promise<void>
+  maxBatchSize?: number
+  flushIntervalMs?: number
+  // Rows with the same key are merged; the later row wins unless merge is given
+  key?: (row: T) => string
+  merge?: (previous: T, next: T) => T
+}
+
+export class WriteBehindBuffer<T> {
+  private entries = new Map<string, BufferedEntry<T>>()
+  private timer: ReturnType<typeof setTimeout> | null = null
+  private inFlight: Promise<void> = Promise.resolve()
+  private sequence = 0
+  private readonly maxBatchSize: number
+  private readonly flushIntervalMs: number
+
+  constructor(private options: WriteBufferOptions<T>) {
+    this.maxBatchSize = options.maxBatchSize ?? 50
+    this.flushIntervalMs = options.flushIntervalMs ?? 1000
+  }
+
+  get size() {
+    return this.entries.size
+  }
+
+  add(row: T): Promise<void> {
+    return new Promise((resolve, reject) => {
+      const key = this.options.key ? this.options.key(row) : String(this.sequence++)
+      const existing = this.entries.get(key)
+
+      if (existing) {
+        existing.row = this.options.merge ? this.options.merge(existing.row, row) : row
+        existing.waiters.push({ resolve, reject })
+      } else {
+        this.entries.set(key, { row, waiters: [{ resolve, reject }] })
+      }
+
+      if (this.entries.size >= this.maxBatchSize) {
+        this.flush().catch(() => undefined)
+      } else if (!this.timer) {
+        this.timer = setTimeout(() => {
+          this.flush().catch(() => undefined)
+        }, this.flushIntervalMs)
+      }
+    })
+  }
+
+  // Writes everything buffered so far. Batches are written one at a time so
+  // later updates to a key never land before earlier ones.
+  flush(): Promise<void> {
+    if (this.timer) {
+      clearTimeout(this.timer)
+      this.timer = null
+    }
+
+    const batch = Array.from(this.entries.values())
+    this.entries.clear()
+    if (batch.length === 0) return this.inFlight
+
+    const run = this.inFlight.then(async () => {
+      let failure: { error: unknown } | null = null
+
+      for (let i = 0; i < batch.length; i += this.maxBatchSize) {
+        const chunk = batch.slice(i, i + this.maxBatchSize)
+        try {
+          // After a failed chunk the rest are rejected rather than written out of order
+          if (failure) throw failure.error
+          await this.options.write(chunk.map(entry => entry.row))
+          chunk.forEach(entry => entry.waiters.forEach(waiter => waiter.resolve()))
+        } catch (error) {
+          failure = failure || { error }
+          chunk.forEach(entry => entry.waiters.forEach(waiter => waiter.reject(error)))
+        }
+      }
+
+      if (failure) throw failure.error
+    })
+
+    this.inFlight = run.catch(() => undefined)
+    return run
+  }
+}
@@ -0,0 +1,92 @@
+-- ANN benchmark for agent_memories-shaped data: recall@k and latency of the
+-- index against an exact scan. Runs on its own unlogged table.
+--
+--   psql "$DATABASE_URL" -v rows=100000 -v index=hnsw -f supabase/benchmarks/agent_memories_ann.sql
+--
+-- Variables: rows (10000), index (hnsw | ivfflat), queries (100), k (5),
+-- ef_search (40, hnsw only), probes (10, ivfflat only)
+
+\if :{?rows} \else \set rows 10000 \endif
+\if :{?index} \else \set index hnsw \endif
+\if :{?queries} \else \set queries 100 \endif
+\if :{?k} \else \set k 5 \endif
+\if :{?ef_search} \else \set ef_search 40 \endif
+\if :{?probes} \else \set probes 10 \endif
+
+\timing off
+set client_min_messages = notice;
+
+select set_config('bench.rows', :'rows', false),
+       set_config('bench.index', :'index', false),
+       set_config('bench.queries', :'queries', false),
+       set_config('bench.k', :'k', false);
+
+set hnsw.ef_search = :ef_search;
+set ivfflat.probes = :probes;
+set maintenance_work_mem = '2GB';
+
+drop table if exists bench_memories;
+create unlogged table bench_memories (
+  id bigint generated always as identity primary key,
+  embedding vector(1536) not null
+);
+
+create or replace function pg_temp.random_embedding()
+returns vector
+language sql volatile
+as $$
+  select array_agg(random() - 0.5)::vector(1536) from generate_series(1, 1536);
+$$;
+
+\echo 'Loading' :rows 'rows...'
+insert into bench_memories (embedding)
+select pg_temp.random_embedding() from generate_series(1, :rows);
+
+\echo 'Building' :index 'index...'
+select case when :'index' = 'ivfflat'
+  then format('create index bench_memories_embedding on bench_memories using ivfflat (embedding vector_cosine_ops) with (lists = %s)', greatest(:rows / 1000, 10))
+  else 'create index bench_memories_embedding on bench_memories using hnsw (embedding vector_cosine_ops) with (m = 16, ef_construction = 64)'
+end \gexec
+analyze bench_memories;
+
+do $$
+declare
+  query_count int := current_setting('bench.queries')::int;
+  k int := current_setting('bench.k')::int;
+  query_embedding vector;
+  exact_ids bigint[];
+  ann_ids bigint[];
+  started timestamptz;
+  latencies float[] := '{}';
+  recalls float[] := '{}';
+  nearest_sql text := 'select array_agg(id) from (select id from bench_memories order by embedding <=> $1 limit $2) nearest';
+begin
+  for i in 1..query_count loop
+    query_embedding := pg_temp.random_embedding();
+
+    -- Ground truth: exact scan with index scans disabled. Dynamic SQL so
+    -- each statement is planned under the current setting.
+    perform set_config('enable_indexscan', 'off', true);
+    execute nearest_sql into exact_ids using query_embedding, k;
+    perform set_config('enable_indexscan', 'on', true);
+
+    started := clock_timestamp();
+    execute nearest_sql into ann_ids using query_embedding, k;
+    latencies := latencies || extract(epoch from clock_timestamp() - started) * 1000;
+
+    recalls := recalls || (
+      select count(*)::float / k from unnest(ann_ids) as found(id) where found.id = any(exact_ids)
+    );
+  end loop;
+
+  raise notice 'index=% rows=% queries=% k=%',
+    current_setting('bench.index'), current_setting('bench.rows'), query_count, k;
+  raise notice 'recall@%: %', k, (select round(avg(r)::numeric, 4) from unnest(recalls) r);
+  raise notice 'latency ms p50: %  p95: %  max: %',
+    (select round(percentile_cont(0.5) within group (order by l)::numeric, 2) from unnest(latencies) l),
+    (select round(percentile_cont(0.95) within group (order by l)::numeric, 2) from unnest(latencies) l),
+    (select round(max(l)::numeric, 2) from unnest(latencies) l);
+end;
+$$;
+
+drop table bench_memories;
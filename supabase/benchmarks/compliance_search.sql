@@ -0,0 +1,109 @@
+-- Latency of search_compliance_checks on compliance_checks-shaped data.
+-- Loads synthetic checks into compliance_checks inside a transaction that is
+-- rolled back at the end; run it against a local or staging database, since
+-- the load holds write locks on the table while it runs.
+--
+--   psql "$DATABASE_URL" -v rows=100000 -f supabase/benchmarks/compliance_search.sql
+--
+-- Variables: rows (100000), queries (200), match_count (20),
+-- candidate_limit (1000)
+
+\if :{?rows} \else \set rows 100000 \endif
+\if :{?queries} \else \set queries 200 \endif
+\if :{?match_count} \else \set match_count 20 \endif
+\if :{?candidate_limit} \else \set candidate_limit 1000 \endif
+
+\timing off
+set client_min_messages = notice;
+
+begin;
+
+select set_config('bench.rows', :'rows', true),
+       set_config('bench.queries', :'queries', true),
+       set_config('bench.match_count', :'match_count', true),
+       set_config('bench.candidate_limit', :'candidate_limit', true);
+
+create or replace function pg_temp.random_words(vocabulary text[], word_count int)
+returns text
+language sql volatile
+as $$
+  select string_agg(vocabulary[1 + floor(random() * array_length(vocabulary, 1))::int], ' ')
+  from generate_series(1, word_count);
+$$;
+
+create temporary table bench_vocabulary as
+select
+  array['User', 'Access', 'Review', 'Firewall', 'Rule', 'Backup', 'Restore', 'Test',
+        'Patch', 'Compliance', 'Report', 'Privileged', 'Account', 'Password', 'Policy',
+        'Vulnerability', 'Scan', 'Incident', 'Response', 'Encryption', 'Key', 'Rotation',
+        'Audit', 'Log', 'Retention', 'Change', 'Approval', 'Antivirus', 'Certificate',
+        'Expiry', 'Quarterly', 'Monthly', 'Server', 'Database', 'Network', 'Endpoint'] as name_words,
+  array['Identity and Access', 'Network Security', 'Change Management', 'Backup and Recovery',
+        'Logging and Monitoring', 'Vendor Management', 'Endpoint Security', 'Data Protection'] as areas,
+  array['export', 'the', 'report', 'from', 'admin', 'console', 'attach', 'screenshot', 'of',
+        'settings', 'confirm', 'with', 'owner', 'before', 'sign', 'off', 'ticket', 'evidence',
+        'folder', 'shared', 'drive', 'latest', 'quarter', 'signed', 'approval', 'email', 'list',
+        'users', 'roles', 'groups', 'servers', 'firewall', 'rules', 'backup', 'job', 'status',
+        'restore', 'test', 'results', 'patch', 'levels', 'scan', 'findings', 'remediation',
+        'plan', 'exceptions', 'register', 'spreadsheet', 'pdf', 'xlsx', 'jira', 'servicenow'] as text_words;
+
+\echo 'Loading' :rows 'checks...'
+insert into compliance_checks (check_type, check_name, area, collection_remarks, spoc_comments, team, status)
+select
+  (array['access_review', 'config_check', 'log_review', 'backup_test'])[1 + floor(random() * 4)::int],
+  pg_temp.random_words(v.name_words, 3 + floor(random() * 3)::int),
+  v.areas[1 + floor(random() * array_length(v.areas, 1))::int],
+  pg_temp.random_words(v.text_words, 12 + floor(random() * 20)::int),
+  case when random() < 0.4 then pg_temp.random_words(v.text_words, 5 + floor(random() * 10)::int) end,
+  (array['IT', 'Security', 'Infrastructure', 'Applications'])[1 + floor(random() * 4)::int],
+  'active'
+from generate_series(1, :rows), bench_vocabulary v;
+
+analyze compliance_checks;
+
+-- A mix of what people type: single common terms, phrases, rare terms and typos
+create temporary table bench_queries (query text not null);
+insert into bench_queries
+select (array[
+  'access review', 'firewall', 'backup restore test', 'privileged account',
+  'encryption key rotation', 'certificate expiry', 'servicenow ticket',
+  'screenshot of settings', 'vulnerabilty scan', 'firwall rules', 'pasword policy',
+  'certficate', 'quarterly access', 'audit log retention', 'antivirus', 'endpoint'
+])[1 + (n % 16)]
+from generate_series(0, :queries - 1) n;
+
+\echo 'Plans for a common term and a misspelling:'
+explain (analyze, buffers, costs off)
+select * from search_compliance_checks('access review', :match_count, :candidate_limit);
+explain (analyze, buffers, costs off)
+select * from search_compliance_checks('firwall rules', :match_count, :candidate_limit);
+
+do $$
+declare
+  match_count int := current_setting('bench.match_count')::int;
+  candidate_limit int := current_setting('bench.candidate_limit')::int;
+  query_text text;
+  found int;
+  started timestamptz;
+  latencies float[] := '{}';
+  result_counts int[] := '{}';
+begin
+  for query_text in select query from bench_queries loop
+    started := clock_timestamp();
+    select count(*) into found from search_compliance_checks(query_text, match_count, candidate_limit);
+    latencies := latencies || extract(epoch from clock_timestamp() - started) * 1000;
+    result_counts := result_counts || found;
+  end loop;
+
+  raise notice 'rows=% queries=% match_count=% candidate_limit=%',
+    current_setting('bench.rows'), array_length(latencies, 1), match_count, candidate_limit;
+  raise notice 'latency ms p50: %  p95: %  max: %',
+    (select round(percentile_cont(0.5) within group (order by l)::numeric, 2) from unnest(latencies) l),
+    (select round(percentile_cont(0.95) within group (order by l)::numeric, 2) from unnest(latencies) l),
+    (select round(max(l)::numeric, 2) from unnest(latencies) l);
+  raise notice 'queries with no results: %',
+    (select count(*) from unnest(result_counts) c where c = 0);
+end;
+$$;
+
+rollback;
@@ -0,0 +1,50 @@
+-- Append-only progress log for evidence sessions. Each step change is one
+-- insert, so parallel collection workers never contend on the session row.
+create table session_progress_events (
+  id bigint generated always as identity primary key,
+  session_id uuid not null references evidence_sessions(id) on delete cascade,
+  step integer not null,
+  title text not null,
+  status step_status not null,
+  message text,
+  created_at timestamptz default now()
+);
+
+-- Latest state per step, maintained from the event log
+create table session_progress_steps (
+  session_id uuid not null references evidence_sessions(id) on delete cascade,
+  step integer not null,
+  title text not null,
+  status step_status not null,
+  message text,
+  last_event_id bigint not null,
+  updated_at timestamptz default now(),
+  primary key (session_id, step)
+);
+
+create index idx_session_progress_events_session_id on session_progress_events(session_id, id);
+
+create or replace function apply_session_progress_event()
+returns trigger as $$
+begin
+  insert into session_progress_steps (session_id, step, title, status, message, last_event_id, updated_at)
+  values (new.session_id, new.step, new.title, new.status, new.message, new.id, new.created_at)
+  on conflict (session_id, step) do update
+    set title = excluded.title,
+        status = excluded.status,
+        message = excluded.message,
+        last_event_id = excluded.last_event_id,
+        updated_at = excluded.updated_at
+    -- Ignore events that arrive after a newer one for the same step
+    where session_progress_steps.last_event_id < excluded.last_event_id;
+  return new;
+end;
+$$ language plpgsql;
+
+create trigger apply_session_progress_event after insert on session_progress_events for each row execute procedure apply_session_progress_event();
+
+alter table session_progress_events enable row level security;
+alter table session_progress_steps enable row level security;
+
+create policy "Authenticated users can view progress events" on session_progress_events for select using (auth.uid() is not null);
+create policy "Authenticated users can view progress steps" on session_progress_steps for select using (auth.uid() is not null);
@@ -0,0 +1,4 @@
+-- Publish progress events and session status changes over Realtime so the
+-- progress stream can push deltas instead of clients polling
+alter publication supabase_realtime add table session_progress_events;
+alter publication supabase_realtime add table evidence_sessions;
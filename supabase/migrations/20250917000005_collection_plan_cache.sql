@@ -0,0 +1,47 @@
+-- AI collection plans cached by check fingerprint (check fields + model id +
+-- prompt version), so repeat sessions skip the planning LLM call
+create table collection_plan_cache (
+  fingerprint text primary key,
+  model_id text not null,
+  prompt_version integer not null,
+  check_type text not null,
+  check_name text,
+  plan text not null,
+  hit_count integer default 0,
+  created_at timestamptz default now(),
+  last_hit_at timestamptz,
+  expires_at timestamptz not null
+);
+
+create index idx_collection_plan_cache_expires_at on collection_plan_cache(expires_at);
+create index idx_collection_plan_cache_check_type on collection_plan_cache(check_type);
+
+alter table collection_plan_cache enable row level security;
+
+create policy "System can manage collection plan cache" on collection_plan_cache for all using (true);
+
+-- Returns an unexpired plan and counts the hit in the same round trip
+create or replace function get_cached_plan(p_fingerprint text)
+returns text
+language sql volatile
+as $$
+  update collection_plan_cache
+  set hit_count = hit_count + 1,
+      last_hit_at = now()
+  where fingerprint = p_fingerprint
+    and expires_at > now()
+  returning plan;
+$$;
+
+-- Hit-rate metrics per model and prompt version
+create or replace view collection_plan_cache_stats as
+select
+  model_id,
+  prompt_version,
+  count(*) as entries,
+  count(*) filter (where expires_at <= now()) as expired_entries,
+  coalesce(sum(hit_count), 0) as hits,
+  -- Every entry was created by exactly one miss
+  coalesce(sum(hit_count)::float / nullif(sum(hit_count) + count(*), 0), 0) as hit_rate
+from collection_plan_cache
+group by model_id, prompt_version;
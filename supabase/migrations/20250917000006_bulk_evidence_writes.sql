@@ -0,0 +1,97 @@
+-- Sessions started more than once left duplicate items per check. Keep one
+-- per (session, check): a reviewed item first, then the newest. The others
+-- are moved to evidence_items_archive rather than dropped.
+create table evidence_items_archive (
+  like evidence_items including defaults,
+  archived_at timestamptz not null default now(),
+  archive_reason text not null
+);
+
+alter table evidence_items_archive enable row level security;
+
+with removed as (
+  delete from evidence_items
+  where id in (
+    select id
+    from (
+      select id, row_number() over (
+        partition by session_id, check_id
+        order by (status in ('approved', 'rejected')) desc, created_at desc, id desc
+      ) as position
+      from evidence_items
+      where session_id is not null and check_id is not null
+    ) ranked
+    where position > 1
+  )
+  returning *
+)
+insert into evidence_items_archive
+select removed.*, now(), 'duplicate (session_id, check_id) before unique index'
+from removed;
+
+-- One evidence item per check per session, so batched evidence writes can
+-- upsert and a retried flush never duplicates rows
+create unique index idx_evidence_items_session_check on evidence_items(session_id, check_id);
+
+-- Approvals from Slack carry a Slack user id (U012ABC), not a uuid
+alter table evidence_items add column approver_slack_user_id text;
+
+-- Batched evidence writes from collection. Restarting a session collects
+-- every check again, but evidence an approver already reviewed keeps its
+-- row and status.
+create or replace function upsert_collected_evidence(items jsonb)
+returns void
+language sql volatile
+as $$
+  insert into evidence_items (
+    session_id, check_id, evidence_type, source_path, file_name, file_size,
+    storage_path, collected_data, status
+  )
+  select
+    i.session_id, i.check_id, i.evidence_type, i.source_path, i.file_name, i.file_size,
+    i.storage_path, i.collected_data, coalesce(i.status, 'pending')
+  from jsonb_to_recordset(items) as i(
+    session_id uuid,
+    check_id uuid,
+    evidence_type text,
+    source_path text,
+    file_name text,
+    file_size bigint,
+    storage_path text,
+    collected_data jsonb,
+    status evidence_status
+  )
+  on conflict (session_id, check_id) do update
+  set evidence_type = excluded.evidence_type,
+      source_path = excluded.source_path,
+      file_name = excluded.file_name,
+      file_size = excluded.file_size,
+      storage_path = excluded.storage_path,
+      collected_data = excluded.collected_data,
+      status = excluded.status
+  where evidence_items.status not in ('approved', 'rejected');
+$$;
+
+-- Applies many evidence status changes in one statement
+create or replace function bulk_update_evidence_status(updates jsonb)
+returns void
+language sql volatile
+as $$
+  update evidence_items
+  set status = u.status,
+      approver_id = coalesce(u.approver_id, evidence_items.approver_id),
+      approver_slack_user_id = coalesce(u.approver_slack_user_id, evidence_items.approver_slack_user_id),
+      approval_notes = coalesce(u.approval_notes, evidence_items.approval_notes),
+      approved_at = u.approved_at,
+      rejected_at = u.rejected_at
+  from jsonb_to_recordset(updates) as u(
+    id uuid,
+    status evidence_status,
+    approver_id uuid,
+    approver_slack_user_id text,
+    approval_notes text,
+    approved_at timestamptz,
+    rejected_at timestamptz
+  )
+  where evidence_items.id = u.id;
+$$;
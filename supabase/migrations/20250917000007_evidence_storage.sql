@@ -0,0 +1,7 @@
+-- Private bucket that evidence downloads are streamed into. Evidence exports
+-- can run to several GB; files over 6 MB are sent with resumable (TUS)
+-- uploads, and the bucket accepts up to 50 GB per object. The project-wide
+-- upload limit (Storage settings) caps this and must be raised to match.
+insert into storage.buckets (id, name, public, file_size_limit)
+values ('evidence', 'evidence', false, 53687091200)
+on conflict (id) do update set file_size_limit = excluded.file_size_limit;
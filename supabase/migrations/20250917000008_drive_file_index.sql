@@ -0,0 +1,33 @@
+create extension if not exists pg_trgm;
+
+-- Local copy of Drive file metadata, kept current from the Drive Changes API
+create table drive_file_index (
+  id text primary key,
+  name text not null,
+  mime_type text,
+  modified_time timestamptz,
+  parents text[] default '{}',
+  md5 text,
+  size bigint,
+  indexed_at timestamptz default now()
+);
+
+-- Position in the change feed per indexed drive
+create table drive_sync_state (
+  drive_key text primary key,
+  page_token text not null,
+  updated_at timestamptz default now()
+);
+
+-- Trigram index serves wildcard name patterns such as AD_User_Report_%FINAL%.xlsx
+create index idx_drive_file_index_name_trgm on drive_file_index using gin (name gin_trgm_ops);
+create index idx_drive_file_index_parents on drive_file_index using gin (parents);
+create index idx_drive_file_index_modified_time on drive_file_index(modified_time desc);
+
+alter table drive_file_index enable row level security;
+alter table drive_sync_state enable row level security;
+
+create policy "System can manage drive file index" on drive_file_index for all using (true);
+create policy "System can manage drive sync state" on drive_sync_state for all using (true);
+
+create trigger update_drive_sync_state_updated_at before update on drive_sync_state for each row execute procedure update_updated_at_column();
@@ -0,0 +1,32 @@
+-- Local copy of OneDrive item metadata, kept current with Graph delta queries
+create table onedrive_item_index (
+  drive_key text not null default 'default',
+  id text not null,
+  name text not null,
+  parent_id text,
+  is_folder boolean default false,
+  mime_type text,
+  last_modified timestamptz,
+  size bigint,
+  quick_xor_hash text,
+  indexed_at timestamptz default now(),
+  primary key (drive_key, id)
+);
+
+-- Delta link to resume from per indexed drive
+create table onedrive_sync_state (
+  drive_key text primary key,
+  delta_link text not null,
+  updated_at timestamptz default now()
+);
+
+create index idx_onedrive_item_index_name_trgm on onedrive_item_index using gin (name gin_trgm_ops);
+create index idx_onedrive_item_index_parent_id on onedrive_item_index(drive_key, parent_id);
+
+alter table onedrive_item_index enable row level security;
+alter table onedrive_sync_state enable row level security;
+
+create policy "System can manage onedrive item index" on onedrive_item_index for all using (true);
+create policy "System can manage onedrive sync state" on onedrive_sync_state for all using (true);
+
+create trigger update_onedrive_sync_state_updated_at before update on onedrive_sync_state for each row execute procedure update_updated_at_column();
@@ -0,0 +1,17 @@
+-- Incremental sheet sync: rows carry a content hash so unchanged rows are
+-- skipped, and rows removed from the sheet are soft-deleted
+alter table compliance_checks add column content_hash text;
+alter table compliance_checks add column deleted_at timestamptz;
+
+create unique index idx_compliance_checks_sheet_row_id on compliance_checks(sheet_row_id);
+
+-- All live row hashes in one response (not subject to the API max_rows cap)
+create or replace function get_compliance_check_hashes()
+returns jsonb
+language sql stable
+as $$
+  select coalesce(jsonb_object_agg(sheet_row_id::text, content_hash), '{}'::jsonb)
+  from compliance_checks
+  where sheet_row_id is not null
+    and deleted_at is null;
+$$;
@@ -0,0 +1,3 @@
+-- Keyset pagination for /api/compliance: (created_at desc, id desc) over live rows
+create index idx_compliance_checks_keyset on compliance_checks(created_at desc, id desc) where deleted_at is null;
+create index idx_compliance_checks_team_keyset on compliance_checks(team, created_at desc, id desc) where deleted_at is null;
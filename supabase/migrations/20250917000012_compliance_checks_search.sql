@@ -0,0 +1,91 @@
+create extension if not exists pg_trgm;
+
+-- Weighted full-text document over the searchable check fields
+alter table compliance_checks add column search_vector tsvector
+  generated always as (
+    setweight(to_tsvector('english', coalesce(check_name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(area, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(collection_remarks, '')), 'C') ||
+    setweight(to_tsvector('english', coalesce(spoc_comments, '')), 'C')
+  ) stored;
+
+create index idx_compliance_checks_search_vector on compliance_checks using gin (search_vector);
+-- Fuzzy matching for typos and partial words, one index per searched column.
+-- The search predicates use the bare columns so each can use its index.
+create index idx_compliance_checks_check_name_trgm on compliance_checks using gin (check_name gin_trgm_ops);
+create index idx_compliance_checks_area_trgm on compliance_checks using gin (area gin_trgm_ops);
+create index idx_compliance_checks_collection_remarks_trgm on compliance_checks using gin (collection_remarks gin_trgm_ops);
+create index idx_compliance_checks_spoc_comments_trgm on compliance_checks using gin (spoc_comments gin_trgm_ops);
+
+-- Ranked search: full-text matches first, trigram matches fill in misspelled
+-- or partial queries. GIN can find matches but not return them in rank
+-- order, so each branch takes at most candidate_limit matches from its index
+-- and ranks only those. That bounds the work for terms that match most rows;
+-- the trade-off is that beyond candidate_limit matches the top results come
+-- from the candidates, not the whole table.
+create or replace function search_compliance_checks(
+  p_query text,
+  match_count int default 20,
+  candidate_limit int default 1000
+)
+returns table (
+  id uuid,
+  check_type text,
+  check_name text,
+  area text,
+  owner text,
+  team text,
+  status text,
+  automate boolean,
+  rank float
+)
+language sql stable
+as $$
+  with text_candidates as (
+    select c.id, c.search_vector
+    from compliance_checks c
+    where c.search_vector @@ websearch_to_tsquery('english', p_query)
+      and c.deleted_at is null
+    limit candidate_limit
+  ),
+  text_matches as (
+    select t.id, ts_rank_cd(t.search_vector, websearch_to_tsquery('english', p_query)) as score
+    from text_candidates t
+    order by score desc
+    limit match_count
+  ),
+  fuzzy_candidates as (
+    select c.id, c.check_name, c.area, c.collection_remarks, c.spoc_comments
+    from compliance_checks c
+    where (p_query <% c.check_name
+        or p_query <% c.area
+        or p_query <% c.collection_remarks
+        or p_query <% c.spoc_comments)
+      and c.deleted_at is null
+    limit candidate_limit
+  ),
+  fuzzy_matches as (
+    -- Name and area matches outrank matches in the free-text columns
+    select f.id, greatest(
+      word_similarity(p_query, f.check_name),
+      word_similarity(p_query, coalesce(f.area, '')),
+      word_similarity(p_query, coalesce(f.collection_remarks, '')) * 0.5,
+      word_similarity(p_query, coalesce(f.spoc_comments, '')) * 0.5
+    ) as score
+    from fuzzy_candidates f
+    order by score desc
+    limit match_count
+  ),
+  ranked as (
+    select coalesce(t.id, f.id) as id,
+      -- Full-text rank dominates; similarity breaks ties and ranks fuzzy-only hits
+      coalesce(t.score, 0) * 10 + coalesce(f.score, 0) as rank
+    from text_matches t
+    full outer join fuzzy_matches f on f.id = t.id
+  )
+  select c.id, c.check_type, c.check_name, c.area, c.owner, c.team, c.status, c.automate, r.rank
+  from ranked r
+  join compliance_checks c on c.id = r.id
+  order by r.rank desc
+  limit match_count;
+$$;
@@ -0,0 +1,169 @@
+-- Trigger-maintained dashboard counters so /api/stats is a single-row read
+create table dashboard_counters (
+  id integer primary key default 1 check (id = 1),
+  total_checks integer not null default 0,
+  automated_checks integer not null default 0,
+  pending_approvals integer not null default 0,
+  active_teams integer not null default 0,
+  updated_at timestamptz default now()
+);
+
+-- Live checks per team; active_teams counts teams with at least one
+create table compliance_team_counts (
+  team text primary key,
+  check_count integer not null default 0
+);
+
+alter table dashboard_counters enable row level security;
+alter table compliance_team_counts enable row level security;
+
+create policy "Public read access" on dashboard_counters for select using (true);
+create policy "Public read access" on compliance_team_counts for select using (true);
+
+-- One counted row's contribution: +1 when a live check appears, -1 when it goes
+create type check_counter_delta as (team text, automate boolean, delta integer);
+
+-- Applies a whole statement's worth of changes with one upsert and one update
+create or replace function apply_check_counter_deltas(deltas check_counter_delta[])
+returns void as $$
+declare
+  teams_added integer := 0;
+  teams_removed integer := 0;
+begin
+  with team_deltas as (
+    select team, sum(delta)::integer as delta
+    from unnest(deltas)
+    where team is not null
+    group by team
+    having sum(delta) <> 0
+  ), applied as (
+    insert into compliance_team_counts (team, check_count)
+    select team, delta from team_deltas
+    on conflict (team) do update
+      set check_count = compliance_team_counts.check_count + excluded.check_count
+    returning team, check_count
+  )
+  -- Team appeared (0 -> n) or disappeared (n -> 0)
+  select
+    count(*) filter (where applied.check_count > 0 and applied.check_count = team_deltas.delta),
+    count(*) filter (where applied.check_count = 0)
+  into teams_added, teams_removed
+  from applied
+  join team_deltas using (team);
+
+  update dashboard_counters
+  set total_checks = total_checks + totals.total_delta,
+      automated_checks = automated_checks + totals.automated_delta,
+      active_teams = active_teams + teams_added - teams_removed,
+      updated_at = now()
+  from (
+    select
+      coalesce(sum(delta), 0) as total_delta,
+      coalesce(sum(delta) filter (where automate), 0) as automated_delta
+    from unnest(deltas)
+  ) totals
+  where id = 1
+    and (totals.total_delta <> 0 or totals.automated_delta <> 0 or teams_added <> teams_removed);
+end;
+$$ language plpgsql;
+
+-- Statement-level: a sheet sync touching thousands of rows runs this once,
+-- not once per row. Rows that stay live with the same team and automate flag
+-- contribute +1 and -1 that cancel out. Blank teams count as no team.
+create or replace function update_check_counters()
+returns trigger as $$
+declare
+  deltas check_counter_delta[];
+begin
+  if tg_op = 'INSERT' then
+    select array_agg(row(nullif(trim(team), ''), automate, 1)::check_counter_delta)
+    into deltas
+    from new_rows
+    where deleted_at is null;
+  elsif tg_op = 'DELETE' then
+    select array_agg(row(nullif(trim(team), ''), automate, -1)::check_counter_delta)
+    into deltas
+    from old_rows
+    where deleted_at is null;
+  else
+    select array_agg(change)
+    into deltas
+    from (
+      select row(nullif(trim(team), ''), automate, 1)::check_counter_delta as change
+      from new_rows
+      where deleted_at is null
+      union all
+      select row(nullif(trim(team), ''), automate, -1)::check_counter_delta
+      from old_rows
+      where deleted_at is null
+    ) changes;
+  end if;
+
+  if deltas is not null then
+    perform apply_check_counter_deltas(deltas);
+  end if;
+
+  return null;
+end;
+$$ language plpgsql;
+
+-- Evidence waiting on an approver is in 'collected' status
+create or replace function update_evidence_counters()
+returns trigger as $$
+declare
+  delta integer := 0;
+begin
+  if tg_op <> 'INSERT' then
+    select delta - count(*) into delta from old_rows where status = 'collected';
+  end if;
+
+  if tg_op <> 'DELETE' then
+    select delta + count(*) into delta from new_rows where status = 'collected';
+  end if;
+
+  if delta <> 0 then
+    update dashboard_counters
+    set pending_approvals = pending_approvals + delta,
+        updated_at = now()
+    where id = 1;
+  end if;
+
+  return null;
+end;
+$$ language plpgsql;
+
+-- Transition tables need one trigger per event
+create trigger update_check_counters_insert after insert on compliance_checks
+  referencing new table as new_rows
+  for each statement execute procedure update_check_counters();
+create trigger update_check_counters_update after update on compliance_checks
+  referencing old table as old_rows new table as new_rows
+  for each statement execute procedure update_check_counters();
+create trigger update_check_counters_delete after delete on compliance_checks
+  referencing old table as old_rows
+  for each statement execute procedure update_check_counters();
+
+create trigger update_evidence_counters_insert after insert on evidence_items
+  referencing new table as new_rows
+  for each statement execute procedure update_evidence_counters();
+create trigger update_evidence_counters_update after update on evidence_items
+  referencing old table as old_rows new table as new_rows
+  for each statement execute procedure update_evidence_counters();
+create trigger update_evidence_counters_delete after delete on evidence_items
+  referencing old table as old_rows
+  for each statement execute procedure update_evidence_counters();
+
+-- Seed from existing data
+insert into compliance_team_counts (team, check_count)
+select nullif(trim(team), ''), count(*)
+from compliance_checks
+where deleted_at is null and nullif(trim(team), '') is not null
+group by nullif(trim(team), '');
+
+insert into dashboard_counters (id, total_checks, automated_checks, pending_approvals, active_teams)
+select
+  1,
+  (select count(*) from compliance_checks where deleted_at is null),
+  (select count(*) from compliance_checks where deleted_at is null and automate),
+  (select count(*) from evidence_items where status = 'collected'),
+  (select count(*) from compliance_team_counts where check_count > 0);
@@ -0,0 +1,59 @@
+-- Junction between sessions and the checks they collect. selected_checks
+-- stays as the API input; this table gives the join real foreign keys.
+create table session_checks (
+  session_id uuid not null references evidence_sessions(id) on delete cascade,
+  check_id uuid not null references compliance_checks(id),
+  position integer not null,
+  primary key (session_id, check_id)
+);
+
+create index idx_session_checks_session_position on session_checks(session_id, position);
+create index idx_session_checks_check_id on session_checks(check_id);
+
+alter table session_checks enable row level security;
+
+create policy "Authenticated users can manage session checks" on session_checks for all using (auth.uid() is not null);
+
+create or replace function populate_session_checks()
+returns trigger as $$
+begin
+  insert into session_checks (session_id, check_id, position)
+  select new.id, selected.check_id, selected.position
+  from unnest(new.selected_checks) with ordinality as selected(check_id, position)
+  on conflict do nothing;
+  return null;
+end;
+$$ language plpgsql;
+
+create trigger populate_session_checks after insert on evidence_sessions for each row execute procedure populate_session_checks();
+
+-- Backfill existing sessions
+insert into session_checks (session_id, check_id, position)
+select s.id, selected.check_id, selected.position
+from evidence_sessions s,
+  unnest(s.selected_checks) with ordinality as selected(check_id, position)
+where exists (select 1 from compliance_checks c where c.id = selected.check_id)
+on conflict do nothing;
+
+-- A session with its checks (in selection order) and each check's evidence
+-- status, in one indexed query
+create or replace function get_session_with_checks(p_session_id uuid)
+returns jsonb
+language sql stable
+as $$
+  select jsonb_build_object(
+    'session', to_jsonb(s),
+    'checks', coalesce((
+      select jsonb_agg(
+        to_jsonb(c) || jsonb_build_object('position', sc.position, 'evidence_status', e.status)
+        order by sc.position
+      )
+      from session_checks sc
+      join compliance_checks c on c.id = sc.check_id
+      left join evidence_items e on e.session_id = sc.session_id and e.check_id = sc.check_id
+      where sc.session_id = s.id
+    ), '[]'::jsonb)
+  )
+  from evidence_sessions s
+  where s.id = p_session_id;
+$$;
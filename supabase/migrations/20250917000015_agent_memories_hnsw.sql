@@ -0,0 +1,43 @@
+-- The ivfflat index was built on an empty table, so its list centroids are
+-- meaningless. HNSW needs no training data and keeps recall as rows arrive.
+drop index if exists idx_agent_memories_embedding;
+
+create index idx_agent_memories_embedding on agent_memories
+  using hnsw (embedding vector_cosine_ops)
+  with (m = 16, ef_construction = 64);
+
+-- IVFFlat alternative (smaller, faster to build; rebuild once data is loaded):
+--   create index idx_agent_memories_embedding on agent_memories
+--     using ivfflat (embedding vector_cosine_ops) with (lists = <rows / 1000>);
+
+-- Order by distance first so the ANN index drives the scan, then apply the
+-- similarity threshold to the k nearest candidates
+create or replace function search_similar_memories(
+  query_embedding vector(1536),
+  match_threshold float default 0.8,
+  match_count int default 5
+)
+returns table (
+  id uuid,
+  check_type text,
+  memory_type memory_type,
+  content jsonb,
+  similarity float
+)
+language sql stable
+as $$
+  select nearest.id, nearest.check_type, nearest.memory_type, nearest.content, nearest.similarity
+  from (
+    select
+      agent_memories.id,
+      agent_memories.check_type,
+      agent_memories.memory_type,
+      agent_memories.content,
+      1 - (agent_memories.embedding <=> query_embedding) as similarity
+    from agent_memories
+    order by agent_memories.embedding <=> query_embedding
+    limit match_count
+  ) nearest
+  where nearest.similarity > match_threshold
+  order by nearest.similarity desc;
+$$;
@@ -0,0 +1,66 @@
+-- Per-memory_type partial HNSW indexes: a filtered search walks a graph that
+-- contains only matching rows, so top-k is not thinned out by a post-filter
+create index idx_agent_memories_embedding_procedural on agent_memories
+  using hnsw (embedding vector_cosine_ops) where memory_type = 'procedural';
+create index idx_agent_memories_embedding_episodic on agent_memories
+  using hnsw (embedding vector_cosine_ops) where memory_type = 'episodic';
+create index idx_agent_memories_embedding_semantic on agent_memories
+  using hnsw (embedding vector_cosine_ops) where memory_type = 'semantic';
+create index idx_agent_memories_embedding_contextual on agent_memories
+  using hnsw (embedding vector_cosine_ops) where memory_type = 'contextual';
+
+-- Selective check_type filters are cheaper as an exact scan of few rows
+create index idx_agent_memories_check_type_memory_type on agent_memories(check_type, memory_type);
+
+-- Filtered nearest-neighbour search. Filters are inlined as literals so the
+-- planner can pick the matching partial index, and iterative index scans
+-- keep pulling candidates until match_count rows pass the filters.
+create or replace function search_memories_filtered(
+  query_embedding vector(1536),
+  p_check_type text default null,
+  p_memory_type memory_type default null,
+  p_min_confidence float default null,
+  match_threshold float default 0.8,
+  match_count int default 5
+)
+returns table (
+  id uuid,
+  check_type text,
+  check_name text,
+  memory_type memory_type,
+  content jsonb,
+  confidence_score float,
+  similarity float
+)
+language plpgsql stable
+set hnsw.iterative_scan = relaxed_order
+as $$
+declare
+  filters text := '';
+begin
+  if p_check_type is not null then
+    filters := filters || format(' and m.check_type = %L', p_check_type);
+  end if;
+  if p_memory_type is not null then
+    filters := filters || format(' and m.memory_type = %L', p_memory_type);
+  end if;
+  if p_min_confidence is not null then
+    filters := filters || format(' and m.confidence_score >= %s', p_min_confidence);
+  end if;
+
+  return query execute format($query$
+    select nearest.*
+    from (
+      select m.id, m.check_type, m.check_name, m.memory_type, m.content, m.confidence_score,
+        1 - (m.embedding <=> $1) as similarity
+      from agent_memories m
+      where m.embedding is not null %s
+      order by m.embedding <=> $1
+      limit $2
+    ) nearest
+    where nearest.similarity > $3
+    order by nearest.similarity desc
+  $query$, filters)
+  using query_embedding, match_count, match_threshold;
+end;
+$$;
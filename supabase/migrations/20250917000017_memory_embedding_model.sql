@@ -0,0 +1,83 @@
+-- Record which model produced each embedding. Vectors from different models
+-- share the vector(1536) column (smaller ones are zero-padded) but are not
+-- comparable, so searches only match rows from the active model.
+alter table agent_memories add column embedding_model text;
+
+update agent_memories
+set embedding_model = 'openai.embedding:text-embedding-ada-002'
+where embedding is not null;
+
+create index idx_agent_memories_embedding_model on agent_memories(embedding_model);
+
+-- Batch write of re-embedded vectors; embedding is passed as '[...]' text
+create or replace function set_memory_embeddings(updates jsonb)
+returns void
+language sql volatile
+as $$
+  update agent_memories
+  set embedding = u.embedding,
+      embedding_model = u.embedding_model
+  from jsonb_to_recordset(updates) as u(
+    id uuid,
+    embedding vector(1536),
+    embedding_model text
+  )
+  where agent_memories.id = u.id;
+$$;
+
+-- Same search as before, plus an embedding_model filter
+drop function if exists search_memories_filtered(vector, text, memory_type, float, float, int);
+
+create or replace function search_memories_filtered(
+  query_embedding vector(1536),
+  p_check_type text default null,
+  p_memory_type memory_type default null,
+  p_min_confidence float default null,
+  match_threshold float default 0.8,
+  match_count int default 5,
+  p_embedding_model text default null
+)
+returns table (
+  id uuid,
+  check_type text,
+  check_name text,
+  memory_type memory_type,
+  content jsonb,
+  confidence_score float,
+  similarity float
+)
+language plpgsql stable
+set hnsw.iterative_scan = relaxed_order
+as $$
+declare
+  filters text := '';
+begin
+  if p_check_type is not null then
+    filters := filters || format(' and m.check_type = %L', p_check_type);
+  end if;
+  if p_memory_type is not null then
+    filters := filters || format(' and m.memory_type = %L', p_memory_type);
+  end if;
+  if p_min_confidence is not null then
+    filters := filters || format(' and m.confidence_score >= %s', p_min_confidence);
+  end if;
+  if p_embedding_model is not null then
+    filters := filters || format(' and m.embedding_model = %L', p_embedding_model);
+  end if;
+
+  return query execute format($query$
+    select nearest.*
+    from (
+      select m.id, m.check_type, m.check_name, m.memory_type, m.content, m.confidence_score,
+        1 - (m.embedding <=> $1) as similarity
+      from agent_memories m
+      where m.embedding is not null %s
+      order by m.embedding <=> $1
+      limit $2
+    ) nearest
+    where nearest.similarity > $3
+    order by nearest.similarity desc
+  $query$, filters)
+  using query_embedding, match_count, match_threshold;
+end;
+$$;
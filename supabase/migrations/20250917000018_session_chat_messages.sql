@@ -0,0 +1,39 @@
+-- Chat history as append-only rows. Appending to evidence_sessions.chat_messages
+-- rewrote the whole array on every message and, as an evidence_sessions
+-- update, reached every realtime subscriber watching session status.
+create table session_chat_messages (
+  id uuid primary key default uuid_generate_v4(),
+  session_id uuid not null references evidence_sessions(id) on delete cascade,
+  sender text not null check (sender in ('user', 'ai')),
+  message text not null,
+  created_at timestamptz not null default now(),
+  -- Write order; a message and its canned reply can share a timestamp
+  seq bigint generated always as identity
+);
+
+create index idx_session_chat_messages_session on session_chat_messages(session_id, seq);
+
+alter table session_chat_messages enable row level security;
+
+create policy "Authenticated users can view chat messages" on session_chat_messages for select using (auth.uid() is not null);
+
+-- Move existing history over, keeping message ids where they are uuids
+insert into session_chat_messages (id, session_id, sender, message, created_at)
+select
+  case
+    when entry->>'id' ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+      then (entry->>'id')::uuid
+    else uuid_generate_v4()
+  end,
+  s.id,
+  case when entry->>'sender' = 'user' then 'user' else 'ai' end,
+  coalesce(entry->>'message', ''),
+  coalesce((entry->>'timestamp')::timestamptz, s.created_at)
+from evidence_sessions s
+cross join lateral jsonb_array_elements(
+  case when jsonb_typeof(s.chat_messages) = 'array' then s.chat_messages else '[]'::jsonb end
+) with ordinality as history(entry, position)
+order by s.id, history.position
+on conflict (id) do nothing;
+
+alter table evidence_sessions drop column chat_messages;